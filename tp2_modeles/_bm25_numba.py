@@ -0,0 +1,56 @@
+"""
+Noyau BM25 compilé avec Numba (optionnel)
+
+Après la conversion SoA/CSR du modèle probabiliste, le calcul du score par
+requête est une boucle numérique serrée sur les entrées CSR — un candidat
+idéal pour la compilation JIT. Ce module fournit un noyau qui fusionne la
+lecture des fréquences, la formule BM25 et l'accumulation en une seule passe
+sur les non-zéros, sans temporaires NumPy et avec parallélisation.
+
+Numba n'est pas une dépendance obligatoire du TP: si le paquet n'est pas
+installé, NUMBA_AVAILABLE vaut False et le modèle retombe sur le chemin
+NumPy vectorisé.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def bm25_score_kernel(tf_indptr, tf_terms, tf_counts, idf, len_norm,
+                          query_weight, k1, scores, touched):
+        """
+        Calculer les scores BM25 de tous les documents en une passe CSR
+
+        Args:
+            tf_indptr: Délimiteurs CSR des documents (int64[num_docs+1])
+            tf_terms: Identifiants de termes triés par document (int32[nnz])
+            tf_counts: Fréquences correspondantes (int32[nnz])
+            idf: IDF par terme du vocabulaire (float64[vocab])
+            len_norm: Normalisation k1*(1-b + b*|d|/avgdl) (float32[num_docs])
+            query_weight: Nombre d'occurrences de chaque terme dans la
+                          requête (float64[vocab], 0 pour les termes absents)
+                          — un terme répété pèse autant de fois, comme sur
+                          le chemin NumPy
+            k1: Paramètre de saturation BM25
+            scores: Tableau de sortie des scores (float64[num_docs])
+            touched: Tableau de sortie, True si le document contient au moins
+                     un terme de la requête (bool[num_docs])
+        """
+        for i in prange(len(tf_indptr) - 1):
+            s = 0.0
+            hit = False
+            for k in range(tf_indptr[i], tf_indptr[i + 1]):
+                term_id = tf_terms[k]
+                w = query_weight[term_id]
+                if w > 0.0:
+                    tf = tf_counts[k]
+                    s += w * idf[term_id] * tf * (k1 + 1) / (tf + len_norm[i])
+                    hit = True
+            scores[i] = s
+            touched[i] = hit
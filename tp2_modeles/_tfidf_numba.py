@@ -0,0 +1,42 @@
+"""
+Noyau de construction TF-IDF compilé avec Numba (optionnel)
+
+Après la vectorisation NumPy du modèle vectoriel, le remplissage de la
+matrice des documents reste une dispersion de non-zéros précédée de deux
+temporaires (log des tf, produit par l'IDF). Ce module fournit un noyau JIT
+qui fusionne lecture des comptes, pondération TF-IDF et écriture dans la
+ligne du document en une seule passe parallèle sur les non-zéros, sans
+tableaux intermédiaires.
+
+Comme pour le noyau BM25, Numba n'est pas une dépendance obligatoire du TP:
+si le paquet n'est pas installé, NUMBA_AVAILABLE vaut False et le modèle
+garde le chemin NumPy vectorisé.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def tfidf_fill_kernel(doc_indptr, cols, counts, idf, out):
+        """
+        Remplir la matrice TF-IDF dense en une passe sur les non-zéros
+
+        Args:
+            doc_indptr: Délimiteurs des documents dans cols/counts (int64[D+1])
+            cols: Identifiants de termes des non-zéros (int64[nnz])
+            counts: Fréquences de termes correspondantes (float64[nnz])
+            idf: IDF par terme du vocabulaire (float32[V])
+            out: Matrice de sortie (float32[D, V]), remplie en place
+        """
+        for d in prange(len(doc_indptr) - 1):
+            for k in range(doc_indptr[d], doc_indptr[d + 1]):
+                term_id = cols[k]
+                out[d, term_id] = (1.0 + np.log10(counts[k])) * idf[term_id]
@@ -0,0 +1,130 @@
+"""
+Statistiques de corpus partagées entre les modèles de recherche
+
+ModeleProbabiliste et ModeleLangue construisaient chacun les mêmes
+structures (fréquences de termes CSR, longueurs de documents, document
+frequencies, fréquences de collection) en re-parcourant tout le corpus.
+Quand les deux modèles sont instanciés — le cas typique d'une comparaison —
+le corpus était traversé deux fois, doublant le temps de construction et
+la mémoire. Ce module construit ces statistiques une seule fois et les
+partage par référence entre les modèles.
+"""
+
+from typing import List, Dict, Set, Tuple
+from collections import Counter, defaultdict
+import numpy as np
+
+
+class CorpusStatistics:
+    """Statistiques pré-calculées sur un corpus, partagées entre modèles"""
+
+    def __init__(self, index_inverse: Dict[str, Set[int]], documents: List[Dict]):
+        """
+        Construire les statistiques du corpus
+
+        Args:
+            index_inverse: Index inversé {terme: {doc_ids}}
+            documents: Liste des documents pré-traités avec leurs tokens
+        """
+        self.num_docs = len(documents)
+
+        # Vocabulaire: terme -> identifiant entier (colonne dans les tableaux)
+        self.vocab = {term: idx for idx, term in enumerate(index_inverse.keys())}
+
+        # Première passe: un Counter par document (boucle de comptage en C),
+        # document frequencies et fréquences de collection sur les termes uniques
+        self.df: Dict[str, int] = defaultdict(int)
+        collection_tf = np.zeros(len(self.vocab), dtype=np.int64)
+        doc_term_counts = []
+        for doc in documents:
+            counts = Counter(doc['tokens'])
+            doc_term_counts.append(counts)
+            for term, count in counts.items():
+                self.df[term] += 1
+                term_id = self.vocab.get(term)
+                if term_id is not None:
+                    collection_tf[term_id] += count
+
+        # Métadonnées des documents en SoA (Structure of Arrays)
+        self.doc_ids_arr = np.array([doc['id'] for doc in documents], dtype=np.int64)
+        self.doc_pos = {int(doc_id): pos for pos, doc_id in enumerate(self.doc_ids_arr)}
+        self.doc_len = np.array([len(doc['tokens']) for doc in documents], dtype=np.int32)
+
+        # Deuxième passe: fréquences de termes au format CSR. tf_indptr
+        # délimite la tranche de chaque document dans tf_terms (ids de
+        # termes triés) et tf_counts (fréquences).
+        nnz = sum(len(counts) for counts in doc_term_counts)
+        self.tf_indptr = np.zeros(self.num_docs + 1, dtype=np.int64)
+        self.tf_terms = np.empty(nnz, dtype=np.int32)
+        self.tf_counts = np.empty(nnz, dtype=np.int32)
+
+        pos = 0
+        for i, counts in enumerate(doc_term_counts):
+            entries = sorted((self.vocab[t], c) for t, c in counts.items()
+                             if t in self.vocab)
+            for term_id, count in entries:
+                self.tf_terms[pos] = term_id
+                self.tf_counts[pos] = count
+                pos += 1
+            self.tf_indptr[i + 1] = pos
+
+        # Fréquences de collection (modèle de langue)
+        self.collection_tf = collection_tf
+        self.collection_length = int(collection_tf.sum())
+
+        # Longueur moyenne des documents (normalisation BM25)
+        if self.num_docs > 0:
+            self.avg_doc_length = float(self.doc_len.mean())
+        else:
+            self.avg_doc_length = 0
+
+        # Listes de postings sous forme de tableaux: pour chaque terme,
+        # les positions des documents qui le contiennent et les fréquences
+        posting_rows = defaultdict(list)
+        posting_tfs = defaultdict(list)
+        for pos, counts in enumerate(doc_term_counts):
+            for term, count in counts.items():
+                posting_rows[term].append(pos)
+                posting_tfs[term].append(count)
+
+        self.postings = {
+            term: (np.array(posting_rows[term], dtype=np.int32),
+                   np.array(posting_tfs[term], dtype=np.float32))
+            for term in posting_rows
+        }
+
+    def tf_in_doc(self, pos: int, term_id: int) -> int:
+        """
+        Fréquence d'un terme dans un document via recherche dichotomique
+
+        Les termes de chaque document sont triés dans tf_terms, donc un
+        searchsorted sur la tranche CSR du document suffit.
+
+        Args:
+            pos: Position du document dans les tableaux
+            term_id: Identifiant du terme dans le vocabulaire
+
+        Returns:
+            Nombre d'occurrences du terme dans le document (0 si absent)
+        """
+        start, end = self.tf_indptr[pos], self.tf_indptr[pos + 1]
+        idx = np.searchsorted(self.tf_terms[start:end], term_id)
+        if start + idx < end and self.tf_terms[start + idx] == term_id:
+            return int(self.tf_counts[start + idx])
+        return 0
+
+
+# Cache des statistiques par (index, documents): instancier plusieurs modèles
+# sur le même corpus réutilise le même objet au lieu de tout reconstruire
+_stats_cache: Dict[Tuple[int, int], CorpusStatistics] = {}
+
+
+def get_corpus_statistics(index_inverse: Dict[str, Set[int]],
+                          documents: List[Dict]) -> CorpusStatistics:
+    """Obtenir (ou construire une seule fois) les statistiques d'un corpus"""
+    key = (id(index_inverse), id(documents))
+    stats = _stats_cache.get(key)
+    if stats is None:
+        stats = CorpusStatistics(index_inverse, documents)
+        _stats_cache[key] = stats
+    return stats
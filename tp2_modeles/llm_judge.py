@@ -5,65 +5,258 @@ Ce module utilise un LLM (Large Language Model) pour évaluer et comparer
 les résultats de différents modèles de recherche d'information.
 """
 
+import asyncio
+import hashlib
 import json
 import os
+import random
+import tempfile
+import time
+from functools import lru_cache
 from typing import List, Dict, Tuple
-from openai import OpenAI
-from anthropic import Anthropic
+import httpx
+import openai
+import anthropic
+from openai import OpenAI, AsyncOpenAI
+from anthropic import Anthropic, AsyncAnthropic
+
+# Erreurs transitoires qui justifient une nouvelle tentative: un appel lent ou
+# limité en débit est souvent plus rapide à relancer qu'à attendre jusqu'au bout
+_RETRYABLE_ERRORS = (
+    openai.APITimeoutError, openai.RateLimitError, openai.APIConnectionError,
+    anthropic.APITimeoutError, anthropic.RateLimitError, anthropic.APIConnectionError,
+)
+
+# Outil Anthropic forcé pour obtenir une évaluation structurée: le fournisseur
+# garantit un JSON conforme au schéma, ce qui élimine l'extraction fragile des
+# blocs ```json dans la réponse (et les appels répétés quand le parsing échoue)
+_EVALUATION_TOOL = {
+    "name": "submit_evaluation",
+    "description": "Soumettre l'évaluation structurée des résultats de recherche",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "evaluations": {
+                "type": "object",
+                "description": "Par modèle: scores par document, score moyen et justification",
+                "additionalProperties": {
+                    "type": "object",
+                    "properties": {
+                        "scores": {"type": "object"},
+                        "score_moyen": {"type": "number"},
+                        "justification": {"type": "string"}
+                    },
+                    "required": ["scores", "score_moyen", "justification"]
+                }
+            },
+            "comparaison": {
+                "type": "object",
+                "properties": {
+                    "meilleur_modele": {"type": "string"},
+                    "justification": {"type": "string"}
+                },
+                "required": ["meilleur_modele", "justification"]
+            }
+        },
+        "required": ["evaluations", "comparaison"]
+    }
+}
+
+
+@lru_cache(maxsize=1)
+def _load_env() -> Dict[str, str]:
+    """
+    Lire le fichier .env du module une seule fois
+
+    Le résultat est mémorisé: instancier plusieurs LLMJudge (un par requête
+    dans certains tests) ne relit pas le fichier à chaque construction.
+    """
+    env = {}
+    try:
+        env_path = os.path.join(os.path.dirname(__file__), '.env')
+        if os.path.exists(env_path):
+            with open(env_path, 'r') as f:
+                for line in f:
+                    if '=' in line and not line.lstrip().startswith('#'):
+                        key, value = line.split('=', 1)
+                        env[key.strip()] = value.strip().strip('"').strip("'")
+    except Exception:
+        pass
+    return env
 
 
 class LLMJudge:
     """Utilise un LLM pour juger la pertinence des résultats de recherche"""
     
-    def __init__(self, provider: str = 'openai', model: str = 'gpt-4o-mini'):
+    def __init__(self, provider: str = 'openai', model: str = 'gpt-4o-mini',
+                 request_timeout: float = 30.0, max_retries: int = 3):
         """
         Initialiser le LLM Judge
-        
+
         Args:
             provider: 'openai' ou 'anthropic'
             model: Nom du modèle à utiliser
+            request_timeout: Timeout par appel LLM, en secondes (défaut: 30)
+            max_retries: Nombre maximum de tentatives par appel (défaut: 3)
         """
         self.provider = provider
         self.model = model
-        
+        self.request_timeout = request_timeout
+        self.max_retries = max_retries
+
+        # Cache des jugements LLM: les mêmes entrées (requête, documents,
+        # résultats, modèle) produisent la même évaluation, donc on évite de
+        # rappeler l'API lors des ré-exécutions d'expériences.
+        # - cache mémoire: ré-évaluations dans le même processus
+        # - cache disque (~/.cache/ri_llm_judge/): ré-exécutions du script
+        self._memory_cache: Dict[str, Dict] = {}
+        # Mémo des jugements par paire (requête, doc_id): les modèles
+        # partagent souvent leurs meilleurs documents, donc une évaluation
+        # dont toutes les paires ont déjà été jugées (par exemple avec un
+        # sous-ensemble de modèles différent) se reconstruit sans appel réseau
+        self._pair_scores: Dict[Tuple[str, str], float] = {}
+        self._cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'ri_llm_judge')
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+        except OSError:
+            self._cache_dir = None
+
+        # Pool de connexions HTTP persistant partagé par les clients sync et
+        # async: le keep-alive amortit le coût TCP+TLS sur tous les appels au
+        # lieu d'une nouvelle poignée de main par client/appel
+        _limits = httpx.Limits(max_connections=64, max_keepalive_connections=64)
+        self._http = httpx.Client(limits=_limits, timeout=self.request_timeout)
+        self._ahttp = httpx.AsyncClient(limits=_limits, timeout=self.request_timeout)
+
         if provider == 'openai':
-            api_key = os.getenv('OPENAI_API_KEY')
-            # Essayer aussi de lire depuis un fichier .env
-            if not api_key:
-                try:
-                    env_path = os.path.join(os.path.dirname(__file__), '.env')
-                    if os.path.exists(env_path):
-                        with open(env_path, 'r') as f:
-                            for line in f:
-                                if line.startswith('OPENAI_API_KEY='):
-                                    api_key = line.split('=', 1)[1].strip().strip('"').strip("'")
-                                    break
-                except Exception as e:
-                    pass
+            # Variable d'environnement, sinon le fichier .env (lu une seule fois)
+            api_key = os.getenv('OPENAI_API_KEY') or _load_env().get('OPENAI_API_KEY')
             if not api_key:
                 print("⚠️  OPENAI_API_KEY non défini. Utilisez 'export OPENAI_API_KEY=votre_cle' ou créez un fichier .env")
-            self.client = OpenAI(api_key=api_key) if api_key else None
+            self.client = OpenAI(api_key=api_key, http_client=self._http) if api_key else None
+            # Client asynchrone pour l'évaluation concurrente de plusieurs requêtes
+            self.aclient = AsyncOpenAI(api_key=api_key, http_client=self._ahttp) if api_key else None
         elif provider == 'anthropic':
-            api_key = os.getenv('ANTHROPIC_API_KEY')
-            # Essayer aussi de lire depuis un fichier .env
-            if not api_key:
-                try:
-                    env_path = os.path.join(os.path.dirname(__file__), '.env')
-                    if os.path.exists(env_path):
-                        with open(env_path, 'r') as f:
-                            for line in f:
-                                if line.startswith('ANTHROPIC_API_KEY='):
-                                    api_key = line.split('=', 1)[1].strip().strip('"').strip("'")
-                                    break
-                except Exception as e:
-                    pass
+            # Variable d'environnement, sinon le fichier .env (lu une seule fois)
+            api_key = os.getenv('ANTHROPIC_API_KEY') or _load_env().get('ANTHROPIC_API_KEY')
             if not api_key:
                 print("⚠️  ANTHROPIC_API_KEY non défini. Utilisez 'export ANTHROPIC_API_KEY=votre_cle' ou créez un fichier .env")
-            self.client = Anthropic(api_key=api_key) if api_key else None
+            self.client = Anthropic(api_key=api_key, http_client=self._http) if api_key else None
+            # Client asynchrone pour l'évaluation concurrente de plusieurs requêtes
+            self.aclient = AsyncAnthropic(api_key=api_key, http_client=self._ahttp) if api_key else None
         else:
             raise ValueError(f"Provider non supporté: {provider}")
-    
-    def evaluate_query(self, query: str, documents: List[Dict], 
+
+    def close(self):
+        """Fermer le pool de connexions HTTP partagé"""
+        self._http.close()
+        try:
+            # Fermer proprement le client async même hors boucle d'événements
+            asyncio.run(self._ahttp.aclose())
+        except RuntimeError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _cache_key(self, query: str, context: Dict,
+                   results_by_model: Dict[str, List[int]]) -> str:
+        """
+        Calculer une clé de cache déterministe pour une évaluation
+
+        La clé couvre tout ce qui influence la réponse du LLM: la requête,
+        le contenu des documents retenus, les résultats par modèle, ainsi que
+        le fournisseur et le modèle utilisés.
+        """
+        payload = json.dumps({
+            'query': query,
+            'documents': sorted(context['documents'].items()),
+            'results': {name: list(doc_ids) for name, doc_ids in results_by_model.items()},
+            'provider': self.provider,
+            'model': self.model
+        }, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _cache_get(self, key: str):
+        """Chercher une évaluation dans le cache mémoire puis sur disque"""
+        if key in self._memory_cache:
+            return self._memory_cache[key]
+        if self._cache_dir:
+            cache_file = os.path.join(self._cache_dir, key + '.json')
+            if os.path.exists(cache_file):
+                try:
+                    with open(cache_file, 'r', encoding='utf-8') as f:
+                        evaluation = json.load(f)
+                    self._memory_cache[key] = evaluation
+                    return evaluation
+                except (OSError, json.JSONDecodeError):
+                    pass
+        return None
+
+    def _cache_set(self, key: str, evaluation: Dict):
+        """Enregistrer une évaluation dans les caches mémoire et disque"""
+        self._memory_cache[key] = evaluation
+        if self._cache_dir:
+            try:
+                cache_file = os.path.join(self._cache_dir, key + '.json')
+                with open(cache_file, 'w', encoding='utf-8') as f:
+                    json.dump(evaluation, f, ensure_ascii=False)
+            except OSError:
+                pass
+
+    def _record_pair_scores(self, query: str, evaluation: Dict):
+        """Mémoriser les scores de pertinence par paire (requête, doc_id)"""
+        for model_eval in evaluation.get('evaluations', {}).values():
+            for doc_id, score in model_eval.get('scores', {}).items():
+                try:
+                    self._pair_scores[(query, str(doc_id))] = float(score)
+                except (TypeError, ValueError):
+                    continue
+
+    def _evaluation_from_pairs(self, query: str,
+                               results_by_model: Dict[str, List[int]]) -> Dict:
+        """
+        Reconstruire une évaluation à partir des paires déjà jugées
+
+        Si chaque (requête, doc_id) demandé a déjà reçu un score de
+        pertinence lors d'un appel précédent, l'évaluation se recompose
+        localement: scores par modèle, moyennes et meilleur modèle, sans
+        nouvel aller-retour réseau.
+
+        Returns:
+            Évaluation reconstruite, ou None si une paire n'est pas connue
+        """
+        evaluations = {}
+        for model_name, doc_ids in results_by_model.items():
+            scores = {}
+            for doc_id in doc_ids:
+                score = self._pair_scores.get((query, str(doc_id)))
+                if score is None:
+                    return None
+                scores[str(doc_id)] = score
+            mean = sum(scores.values()) / len(scores) if scores else 0.0
+            evaluations[model_name] = {
+                "scores": scores,
+                "score_moyen": mean,
+                "justification": "Scores repris de jugements précédents sur les mêmes paires (requête, document)"
+            }
+
+        if not evaluations:
+            return None
+
+        best = max(evaluations, key=lambda name: evaluations[name]["score_moyen"])
+        return {
+            "evaluations": evaluations,
+            "comparaison": {
+                "meilleur_modele": best,
+                "justification": "Meilleur score moyen parmi des jugements par paire déjà rendus"
+            }
+        }
+
+    def evaluate_query(self, query: str, documents: List[Dict],
                       results_by_model: Dict[str, List[int]]) -> Dict:
         """
         Évaluer les résultats de différents modèles pour une requête
@@ -78,42 +271,439 @@ class LLMJudge:
         """
         if not self.client:
             return self._mock_evaluation(query, results_by_model)
-        
+
         # Préparer le contexte pour le LLM
         context = self._prepare_context(query, documents, results_by_model)
-        
+
+        # Consulter le cache avant d'appeler l'API
+        cache_key = self._cache_key(query, context, results_by_model)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            self._record_pair_scores(query, cached)
+            return cached
+
+        # Toutes les paires (requête, doc_id) ont-elles déjà été jugées?
+        # Les modèles se recouvrent beaucoup sur leurs meilleurs documents:
+        # recomposer l'évaluation à partir du mémo évite l'appel réseau
+        from_pairs = self._evaluation_from_pairs(query, results_by_model)
+        if from_pairs is not None:
+            return from_pairs
+
         # Appeler le LLM
         prompt = self._create_evaluation_prompt(context)
-        
+
         try:
-            if self.provider == 'openai':
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "Tu es un expert en recherche d'information. Tu évalues la pertinence des résultats de recherche."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.3
-                )
-                evaluation_text = response.choices[0].message.content
-            else:  # anthropic
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=2000,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ]
-                )
-                evaluation_text = response.content[0].text
-            
-            # Parser la réponse
-            evaluation = self._parse_evaluation(evaluation_text, results_by_model)
+            # Le JSON est garanti par le fournisseur, la réponse est déjà structurée
+            evaluation = self._call_with_retry(prompt)
+            self._cache_set(cache_key, evaluation)
+            self._record_pair_scores(query, evaluation)
             return evaluation
-            
+
         except Exception as e:
             print(f"Erreur lors de l'appel au LLM: {e}")
             return self._mock_evaluation(query, results_by_model)
-    
+
+    def _call_llm(self, prompt: str) -> Dict:
+        """
+        Appeler le LLM de manière synchrone (un seul essai, avec timeout)
+
+        Le JSON est garanti par le fournisseur: mode JSON pour OpenAI,
+        appel d'outil forcé pour Anthropic. Plus besoin d'extraire le JSON
+        de la réponse avec des heuristiques.
+
+        Args:
+            prompt: Prompt d'évaluation à envoyer au LLM
+
+        Returns:
+            Évaluation structurée (dictionnaire)
+        """
+        if self.provider == 'openai':
+            response = self.client.with_options(timeout=self.request_timeout).chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": "Tu es un expert en recherche d'information. Tu évalues la pertinence des résultats de recherche."},
+                    {"role": "user", "content": prompt}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0
+            )
+            return json.loads(response.choices[0].message.content)
+        else:  # anthropic
+            response = self.client.with_options(timeout=self.request_timeout).messages.create(
+                model=self.model,
+                max_tokens=2000,
+                tools=[_EVALUATION_TOOL],
+                tool_choice={"type": "tool", "name": "submit_evaluation"},
+                messages=[
+                    {"role": "user", "content": prompt}
+                ]
+            )
+            return response.content[0].input
+
+    def _call_with_retry(self, prompt: str) -> Dict:
+        """
+        Appeler le LLM avec timeout et nouvelles tentatives
+
+        Un appel lent (longue traîne de latence) ou une erreur transitoire
+        (timeout, limite de débit, erreur de connexion) déclenche une nouvelle
+        tentative avec backoff exponentiel et jitter aléatoire, plutôt que de
+        bloquer toute l'évaluation.
+
+        Args:
+            prompt: Prompt d'évaluation à envoyer au LLM
+
+        Returns:
+            Évaluation structurée (dictionnaire)
+
+        Raises:
+            La dernière erreur rencontrée si toutes les tentatives échouent
+        """
+        for attempt in range(self.max_retries):
+            try:
+                return self._call_llm(prompt)
+            except _RETRYABLE_ERRORS:
+                if attempt == self.max_retries - 1:
+                    raise
+                # Backoff exponentiel avec jitter pour désynchroniser les retries
+                time.sleep(1.0 * (2 ** attempt) + random.random())
+
+    async def _call_llm_async(self, prompt: str) -> Dict:
+        """
+        Appeler le LLM de manière asynchrone
+
+        Version asynchrone de l'appel au LLM, utilisée par evaluate_queries_async
+        pour lancer plusieurs évaluations en parallèle.
+
+        Args:
+            prompt: Prompt d'évaluation à envoyer au LLM
+
+        Returns:
+            Évaluation structurée (dictionnaire)
+        """
+        if self.provider == 'openai':
+            response = await self.aclient.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": "Tu es un expert en recherche d'information. Tu évalues la pertinence des résultats de recherche."},
+                    {"role": "user", "content": prompt}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0
+            )
+            return json.loads(response.choices[0].message.content)
+        else:  # anthropic
+            response = await self.aclient.messages.create(
+                model=self.model,
+                max_tokens=2000,
+                tools=[_EVALUATION_TOOL],
+                tool_choice={"type": "tool", "name": "submit_evaluation"},
+                messages=[
+                    {"role": "user", "content": prompt}
+                ]
+            )
+            return response.content[0].input
+
+    async def _call_with_retry_async(self, prompt: str) -> Dict:
+        """
+        Version asynchrone de _call_with_retry
+
+        Applique le timeout avec asyncio.wait_for et retente avec backoff
+        exponentiel sur timeout ou erreur transitoire.
+        """
+        for attempt in range(self.max_retries):
+            try:
+                return await asyncio.wait_for(self._call_llm_async(prompt),
+                                              timeout=self.request_timeout)
+            except (asyncio.TimeoutError,) + _RETRYABLE_ERRORS:
+                if attempt == self.max_retries - 1:
+                    raise
+                await asyncio.sleep(1.0 * (2 ** attempt) + random.random())
+
+    async def evaluate_queries_async(self, queries_batch: List[Dict],
+                                     max_concurrency: int = 10) -> List[Dict]:
+        """
+        Évaluer plusieurs requêtes en parallèle (appels LLM concurrents)
+
+        Au lieu d'un aller-retour HTTP bloquant par requête, les appels sont
+        lancés simultanément avec asyncio.gather, bornés par un sémaphore pour
+        respecter les limites de débit de l'API. Pour N requêtes, le temps total
+        est proche de celui d'un seul appel (borné par max_concurrency).
+
+        Args:
+            queries_batch: Liste de dictionnaires, chacun contenant:
+                          - 'query': Requête de recherche
+                          - 'documents': Liste des documents avec leur contenu
+                          - 'results_by_model': Dictionnaire {nom_modele: [doc_ids]}
+            max_concurrency: Nombre maximum d'appels simultanés (défaut: 10)
+
+        Returns:
+            Liste des évaluations, dans le même ordre que queries_batch
+        """
+        if not self.aclient:
+            return [self._mock_evaluation(item['query'], item['results_by_model'])
+                    for item in queries_batch]
+
+        sem = asyncio.Semaphore(max_concurrency)
+
+        async def _bounded(item: Dict) -> Dict:
+            # Limiter le nombre d'appels simultanés avec le sémaphore
+            context = self._prepare_context(item['query'], item['documents'],
+                                            item['results_by_model'])
+            cache_key = self._cache_key(item['query'], context, item['results_by_model'])
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+            prompt = self._create_evaluation_prompt(context)
+            try:
+                async with sem:
+                    evaluation = await self._call_with_retry_async(prompt)
+                self._cache_set(cache_key, evaluation)
+                return evaluation
+            except Exception as e:
+                print(f"Erreur lors de l'appel au LLM: {e}")
+                return self._mock_evaluation(item['query'], item['results_by_model'])
+
+        return await asyncio.gather(*[_bounded(item) for item in queries_batch])
+
+    def evaluate_queries(self, queries_batch: List[Dict],
+                         max_concurrency: int = 10) -> List[Dict]:
+        """
+        Version synchrone de evaluate_queries_async
+
+        Enrobe simplement l'appel asynchrone dans asyncio.run pour les
+        appelants qui ne sont pas dans une boucle d'événements.
+
+        Args:
+            queries_batch: Liste de dictionnaires (voir evaluate_queries_async)
+            max_concurrency: Nombre maximum d'appels simultanés (défaut: 10)
+
+        Returns:
+            Liste des évaluations, dans le même ordre que queries_batch
+        """
+        return asyncio.run(self.evaluate_queries_async(queries_batch, max_concurrency))
+
+    def submit_batch(self, queries_batch: List[Dict]) -> str:
+        """
+        Soumettre un lot de requêtes via l'API Batch du fournisseur
+
+        Pour les évaluations hors-ligne (cas typique de compare_models sur un
+        jeu de test), les API Batch d'OpenAI et d'Anthropic traitent les
+        requêtes en masse à moitié prix et avec un débit agrégé bien supérieur
+        aux appels synchrones individuels.
+
+        Args:
+            queries_batch: Liste de dictionnaires, chacun contenant:
+                          - 'custom_id': Identifiant unique de la requête
+                          - 'query': Requête de recherche
+                          - 'documents': Liste des documents avec leur contenu
+                          - 'results_by_model': Dictionnaire {nom_modele: [doc_ids]}
+
+        Returns:
+            Identifiant du batch soumis (à passer à poll_batch)
+        """
+        if not self.client:
+            raise RuntimeError("Client LLM non configuré: impossible de soumettre un batch")
+
+        # Construire une requête par entrée, identifiée par son custom_id
+        requests = []
+        for item in queries_batch:
+            context = self._prepare_context(item['query'], item['documents'],
+                                            item['results_by_model'])
+            prompt = self._create_evaluation_prompt(context)
+            requests.append((item['custom_id'], prompt))
+
+        if self.provider == 'openai':
+            # L'API Batch d'OpenAI prend un fichier JSONL: une ligne par
+            # requête. Fichier temporaire supprimé après l'upload — pas de
+            # résidu dans le répertoire de travail
+            with tempfile.NamedTemporaryFile('w', suffix='.jsonl',
+                                             encoding='utf-8',
+                                             delete=False) as f:
+                batch_filename = f.name
+                for custom_id, prompt in requests:
+                    f.write(json.dumps({
+                        "custom_id": str(custom_id),
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": {
+                            "model": self.model,
+                            "messages": [
+                                {"role": "system", "content": "Tu es un expert en recherche d'information. Tu évalues la pertinence des résultats de recherche."},
+                                {"role": "user", "content": prompt}
+                            ],
+                            # Mêmes garanties que le chemin synchrone : mode
+                            # JSON (pas de bloc ``` à extraire au parsing)
+                            # et température déterministe
+                            "response_format": {"type": "json_object"},
+                            "temperature": 0
+                        }
+                    }, ensure_ascii=False) + '\n')
+
+            # Uploader le fichier puis créer le job batch
+            try:
+                with open(batch_filename, 'rb') as f:
+                    batch_file = self.client.files.create(file=f, purpose="batch")
+            finally:
+                os.remove(batch_filename)
+            batch = self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            return batch.id
+        else:  # anthropic
+            # L'API Message Batches d'Anthropic prend les requêtes directement
+            batch = self.client.messages.batches.create(
+                requests=[
+                    {
+                        "custom_id": str(custom_id),
+                        "params": {
+                            "model": self.model,
+                            "max_tokens": 2000,
+                            # Outil forcé comme sur le chemin synchrone : la
+                            # réponse est un appel d'outil déjà structuré
+                            "tools": [_EVALUATION_TOOL],
+                            "tool_choice": {"type": "tool",
+                                            "name": "submit_evaluation"},
+                            "messages": [{"role": "user", "content": prompt}]
+                        }
+                    }
+                    for custom_id, prompt in requests
+                ]
+            )
+            return batch.id
+
+    def poll_batch(self, batch_id: str, queries_batch: List[Dict],
+                   interval: int = 30) -> Dict[str, Dict]:
+        """
+        Attendre la fin d'un batch et récupérer les évaluations
+
+        Interroge périodiquement le statut du batch jusqu'à sa complétion,
+        puis télécharge les résultats et les parse avec _parse_evaluation.
+
+        Args:
+            batch_id: Identifiant retourné par submit_batch
+            queries_batch: Le lot soumis (pour retrouver results_by_model par custom_id)
+            interval: Intervalle entre deux interrogations, en secondes (défaut: 30)
+
+        Returns:
+            Dictionnaire {custom_id: evaluation}
+        """
+        results_by_id = {str(item['custom_id']): item['results_by_model']
+                         for item in queries_batch}
+        evaluations = {}
+
+        if self.provider == 'openai':
+            # Attendre que le job soit terminé
+            while True:
+                batch = self.client.batches.retrieve(batch_id)
+                if batch.status == 'completed':
+                    break
+                if batch.status in ('failed', 'expired', 'cancelled'):
+                    raise RuntimeError(f"Batch {batch_id} terminé avec le statut: {batch.status}")
+                time.sleep(interval)
+
+            # Télécharger et parser le fichier de sortie (une ligne JSON par requête)
+            output = self.client.files.content(batch.output_file_id)
+            for line in output.text.splitlines():
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                custom_id = result['custom_id']
+                # Entrée en échec : response est null (avec un objet error),
+                # substituer une évaluation mock plutôt que de faire échouer
+                # tout le lot après l'attente
+                response = result.get('response')
+                if not response or result.get('error'):
+                    evaluations[custom_id] = self._mock_evaluation(
+                        "", results_by_id.get(custom_id, {}))
+                    continue
+                text = response['body']['choices'][0]['message']['content']
+                evaluations[custom_id] = self._parse_evaluation(
+                    text, results_by_id.get(custom_id, {}))
+        else:  # anthropic
+            while True:
+                batch = self.client.messages.batches.retrieve(batch_id)
+                if batch.processing_status == 'ended':
+                    break
+                time.sleep(interval)
+
+            for result in self.client.messages.batches.results(batch_id):
+                custom_id = result.custom_id
+                # Entrée en échec (errored/canceled/expired) : pas de
+                # message, substituer une évaluation mock au lieu de
+                # perdre tout le lot
+                entry = result.result
+                if getattr(entry, 'type', 'succeeded') != 'succeeded':
+                    evaluations[custom_id] = self._mock_evaluation(
+                        "", results_by_id.get(custom_id, {}))
+                    continue
+                # Outil forcé : le premier bloc de contenu est l'appel
+                # d'outil, son input est l'évaluation déjà structurée
+                payload = entry.message.content[0].input
+                evaluations[custom_id] = self._parse_evaluation(
+                    payload, results_by_id.get(custom_id, {}))
+
+        return evaluations
+
+    def evaluate_query_batch(self, queries_batch: List[Dict],
+                             mode: str = "batch_api",
+                             interval: int = 30) -> Dict[str, Dict]:
+        """
+        Évaluer un lot de requêtes via l'API Batch (mode hors-ligne)
+
+        Args:
+            queries_batch: Liste de dictionnaires (voir submit_batch)
+            mode: 'batch_api' pour l'API Batch du fournisseur (seul mode supporté)
+            interval: Intervalle d'interrogation du statut, en secondes
+
+        Returns:
+            Dictionnaire {custom_id: evaluation}
+        """
+        if mode != "batch_api":
+            raise ValueError(f"Mode non supporté: {mode}")
+
+        if not self.client:
+            return {str(item['custom_id']): self._mock_evaluation(
+                        item['query'], item['results_by_model'])
+                    for item in queries_batch}
+
+        batch_id = self.submit_batch(queries_batch)
+        print(f"✓ Batch soumis: {batch_id}")
+        return self.poll_batch(batch_id, queries_batch, interval=interval)
+
+    @staticmethod
+    def _snippet(text: str, query_terms: List[str], window: int = 200) -> str:
+        """
+        Extraire un extrait du document autour du premier terme de la requête
+
+        Les tokens du prompt dominent la latence et le coût des appels LLM:
+        envoyer le texte intégral de chaque document est inutile pour juger
+        la pertinence. On tronque à ±window caractères autour de la première
+        occurrence d'un terme de la requête (ou au début du texte sinon).
+        """
+        if len(text) <= 2 * window:
+            return text
+
+        lower = text.lower()
+        match_pos = -1
+        for term in query_terms:
+            pos = lower.find(term.lower())
+            if pos != -1 and (match_pos == -1 or pos < match_pos):
+                match_pos = pos
+
+        if match_pos == -1:
+            return text[:2 * window] + '…'
+
+        start = max(0, match_pos - window)
+        end = min(len(text), match_pos + window)
+        snippet = text[start:end]
+        if start > 0:
+            snippet = '…' + snippet
+        if end < len(text):
+            snippet = snippet + '…'
+        return snippet
+
     def _prepare_context(self, query: str, documents: List[Dict],
                         results_by_model: Dict[str, List[int]]) -> Dict:
         """Préparer le contexte pour l'évaluation"""
@@ -122,84 +712,80 @@ class LLMJudge:
             'documents': {},
             'results': {}
         }
-        
-        # Ajouter les documents pertinents
+
+        # Ajouter les documents pertinents, tronqués en extraits autour des
+        # termes de la requête pour réduire les tokens du prompt
         all_doc_ids = set()
         for doc_ids in results_by_model.values():
             all_doc_ids.update(doc_ids)
-        
+
+        query_terms = query.split()
         for doc in documents:
             if doc['id'] in all_doc_ids:
-                context['documents'][doc['id']] = doc.get('text', '')
-        
+                context['documents'][doc['id']] = self._snippet(
+                    doc.get('text', ''), query_terms)
+
         # Ajouter les résultats par modèle
         context['results'] = results_by_model
-        
+
         return context
-    
+
     def _create_evaluation_prompt(self, context: Dict) -> str:
-        """Créer le prompt pour l'évaluation"""
-        query = context['query']
-        documents = context['documents']
-        results = context['results']
-        
+        """
+        Créer le prompt pour l'évaluation
+
+        Le contexte est sérialisé en JSON compact plutôt qu'en Markdown
+        décoré: moins de tokens d'entrée, donc meilleure latence et coût
+        réduit, sans perte d'information pour le modèle.
+        """
+        payload = json.dumps({
+            'requete': context['query'],
+            'documents': context['documents'],
+            'resultats_par_modele': {model: sorted(doc_ids)
+                                     for model, doc_ids in context['results'].items()}
+        }, ensure_ascii=False, separators=(',', ':'))
+
         prompt = f"""Évalue la pertinence des résultats de recherche pour la requête suivante.
 
-REQUÊTE: "{query}"
+DONNÉES (JSON):
+{payload}
 
-DOCUMENTS RETRIEVÉS:
-"""
-        for doc_id, text in documents.items():
-            prompt += f"\nDocument {doc_id}: {text}\n"
-        
-        prompt += "\n\nRÉSULTATS PAR MODÈLE:\n"
-        for model_name, doc_ids in results.items():
-            prompt += f"\n{model_name}: Documents {sorted(doc_ids)}\n"
-        
-        prompt += """
 ÉVALUATION DEMANDÉE:
 1. Pour chaque modèle, évalue la pertinence des documents retournés (0-10 pour chaque document)
 2. Compare les modèles et identifie lequel retourne les résultats les plus pertinents
 3. Donne une justification pour chaque évaluation
 
-Format de réponse (JSON):
-{
-  "evaluations": {
-    "nom_modele": {
-      "scores": {"doc_id": score},
+Réponds UNIQUEMENT avec un objet JSON, sans texte autour, au format:
+{{
+  "evaluations": {{
+    "nom_modele": {{
+      "scores": {{"doc_id": score}},
       "score_moyen": float,
       "justification": "texte"
-    }
-  },
-  "comparaison": {
+    }}
+  }},
+  "comparaison": {{
     "meilleur_modele": "nom",
     "justification": "texte"
-  }
-}
+  }}
+}}
 """
         return prompt
     
-    def _parse_evaluation(self, text: str, results_by_model: Dict) -> Dict:
-        """Parser la réponse du LLM"""
+    def _parse_evaluation(self, payload, results_by_model: Dict) -> Dict:
+        """
+        Convertir une réponse LLM en évaluation structurée
+
+        Le JSON étant garanti par le fournisseur (mode JSON OpenAI, outil
+        forcé Anthropic), il n'y a plus d'extraction de blocs ``` à faire:
+        un json.loads direct suffit pour les réponses textuelles, et les
+        réponses déjà structurées (tool-use) passent telles quelles.
+        """
+        if isinstance(payload, dict):
+            return payload
         try:
-            # Essayer d'extraire le JSON
-            if '```json' in text:
-                json_start = text.find('```json') + 7
-                json_end = text.find('```', json_start)
-                json_text = text[json_start:json_end].strip()
-            elif '```' in text:
-                json_start = text.find('```') + 3
-                json_end = text.find('```', json_start)
-                json_text = text[json_start:json_end].strip()
-            else:
-                # Chercher le premier { et dernier }
-                json_start = text.find('{')
-                json_end = text.rfind('}') + 1
-                json_text = text[json_start:json_end]
-            
-            evaluation = json.loads(json_text)
-            return evaluation
-        except:
+            return json.loads(payload)
+        except (TypeError, json.JSONDecodeError):
             # Si le parsing échoue, retourner une évaluation mock
             return self._mock_evaluation("", results_by_model)
     
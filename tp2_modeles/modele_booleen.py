@@ -8,15 +8,23 @@ une expression booléenne (AND, OR, NOT) sur les termes de la requête.
 from typing import Set, List, Dict
 from collections import defaultdict
 import re
+import numpy as np
+
+# Liste de postings vide partagée (terme absent de l'index)
+_EMPTY_POSTINGS = np.empty(0, dtype=np.int32)
+
+# Au-delà de cette taille de corpus, les bitsets deviennent trop coûteux en
+# mémoire (un bit par document et par terme) et on garde les tableaux triés
+_BITSET_MAX_DOCS = 1_000_000
 
 
 class ModeleBooleen:
     """Implémentation du modèle booléen de recherche"""
-    
+
     def __init__(self, index_inverse: Dict[str, Set[int]]):
         """
         Initialiser le modèle booléen avec un index inversé
-        
+
         Args:
             index_inverse: Dictionnaire {terme: {doc_ids}}
         """
@@ -25,68 +33,210 @@ class ModeleBooleen:
             (max(doc_ids) for doc_ids in index_inverse.values() if doc_ids),
             default=0
         )
-    
+
+        # Listes de postings sous forme de tableaux int32 triés: les
+        # opérations booléennes deviennent des fusions de listes triées
+        # (np.intersect1d / union / setdiff) au lieu d'opérations sur des
+        # sets Python qui allouent un nouveau set à chaque étape
+        self._postings = {
+            term: np.fromiter(sorted(doc_ids), dtype=np.int32, count=len(doc_ids))
+            for term, doc_ids in index_inverse.items()
+        }
+        self._all_docs = np.arange(1, self.num_docs + 1, dtype=np.int32)
+
+        # Pour les corpus petits/moyens, chaque liste de postings est aussi
+        # encodée en bitset compacté (un bit par document): AND/OR/NOT
+        # deviennent des opérations bit-à-bit vectorisées, sans branchement,
+        # à la vitesse de la bande passante mémoire
+        self._use_bitsets = 0 < self.num_docs <= _BITSET_MAX_DOCS
+        if self._use_bitsets:
+            # Les bits sont indexés directement par doc_id (le bit 0 est inutilisé)
+            nbits = self.num_docs + 1
+            self._bitsets = {}
+            for term, postings in self._postings.items():
+                bits = np.zeros(nbits, dtype=np.uint8)
+                bits[postings] = 1
+                self._bitsets[term] = np.packbits(bits)
+            all_bits = np.zeros(nbits, dtype=np.uint8)
+            all_bits[1:] = 1
+            self._all_bits = np.packbits(all_bits)
+            self._empty_bits = np.zeros(len(self._all_bits), dtype=np.uint8)
+
+    def _bits_to_doc_ids(self, bits: np.ndarray) -> Set[int]:
+        """Décoder un bitset compacté en ensemble d'identifiants de documents"""
+        doc_ids = np.nonzero(np.unpackbits(bits, count=self.num_docs + 1))[0]
+        return set(map(int, doc_ids))
+
     def get_posting_list(self, term: str) -> Set[int]:
         """Récupérer la liste de postings pour un terme"""
         return self.index.get(term, set())
-    
+
+    def _get_postings_array(self, term: str) -> np.ndarray:
+        """Récupérer la liste de postings triée (tableau int32) pour un terme"""
+        return self._postings.get(term, _EMPTY_POSTINGS)
+
     def search_and(self, terms: List[str]) -> Set[int]:
         """Recherche AND : documents contenant TOUS les termes"""
         if not terms:
             return set()
-        
-        result = self.get_posting_list(terms[0])
-        for term in terms[1:]:
-            result = result.intersection(self.get_posting_list(term))
-        
-        return result
-    
+
+        if self._use_bitsets:
+            # Réduction bit-à-bit en place: une passe vectorisée par terme
+            acc = self._bitsets.get(terms[0], self._empty_bits).copy()
+            for term in terms[1:]:
+                np.bitwise_and(acc, self._bitsets.get(term, self._empty_bits), out=acc)
+            return self._bits_to_doc_ids(acc)
+
+        # Intersecter en commençant par la liste la plus courte: le résultat
+        # est borné par la plus petite liste et chaque étape peut court-circuiter
+        postings = sorted((self._get_postings_array(term) for term in terms), key=len)
+        result = postings[0]
+        for posting in postings[1:]:
+            result = np.intersect1d(result, posting, assume_unique=True)
+            if result.size == 0:
+                break
+
+        return set(map(int, result))
+
     def search_or(self, terms: List[str]) -> Set[int]:
         """Recherche OR : documents contenant AU MOINS UN terme"""
         if not terms:
             return set()
-        
-        result = self.get_posting_list(terms[0])
-        for term in terms[1:]:
-            result = result.union(self.get_posting_list(term))
-        
-        return result
-    
+
+        if self._use_bitsets:
+            acc = self._bitsets.get(terms[0], self._empty_bits).copy()
+            for term in terms[1:]:
+                np.bitwise_or(acc, self._bitsets.get(term, self._empty_bits), out=acc)
+            return self._bits_to_doc_ids(acc)
+
+        union = np.unique(np.concatenate(
+            [self._get_postings_array(term) for term in terms]))
+        return set(map(int, union))
+
     def search_not(self, term: str) -> Set[int]:
         """Recherche NOT : documents ne contenant PAS le terme"""
-        term_docs = self.get_posting_list(term)
-        all_docs = set(range(1, self.num_docs + 1))
-        return all_docs - term_docs
+        if self._use_bitsets:
+            # XOR avec le bitmap du corpus = complément restreint aux documents
+            acc = self._all_bits ^ self._bitsets.get(term, self._empty_bits)
+            return self._bits_to_doc_ids(acc)
+
+        term_docs = self._get_postings_array(term)
+        result = np.setdiff1d(self._all_docs, term_docs, assume_unique=True)
+        return set(map(int, result))
     
+    def _tokenize_expression(self, query: str) -> List[tuple]:
+        """
+        Découper une expression booléenne en tokens
+
+        Les opérateurs AND/OR/NOT sont reconnus quelle que soit leur casse,
+        les termes sont normalisés en minuscules, les parenthèses sont des
+        tokens à part entière.
+
+        Returns:
+            Liste de tokens ('TERM', t) | ('OP', 'AND'|'OR'|'NOT') | ('LP',) | ('RP',)
+        """
+        tokens = []
+        for raw in re.findall(r'\(|\)|[^\s()]+', query):
+            if raw == '(':
+                tokens.append(('LP',))
+            elif raw == ')':
+                tokens.append(('RP',))
+            elif raw.upper() in ('AND', 'OR', 'NOT'):
+                tokens.append(('OP', raw.upper()))
+            else:
+                tokens.append(('TERM', raw.lower()))
+        return tokens
+
+    def _to_rpn(self, tokens: List[tuple]) -> List[tuple]:
+        """
+        Convertir les tokens en notation polonaise inverse (shunting-yard)
+
+        Précédences: NOT > AND > OR. NOT est unaire et associatif à droite.
+        Une passe linéaire, sans rescans de la chaîne ni récursion profonde.
+        """
+        precedence = {'NOT': 3, 'AND': 2, 'OR': 1}
+        output = []
+        op_stack = []
+
+        for token in tokens:
+            kind = token[0]
+            if kind == 'TERM':
+                output.append(token)
+            elif kind == 'OP':
+                op = token[1]
+                while (op_stack and op_stack[-1][0] == 'OP'
+                       and (precedence[op_stack[-1][1]] > precedence[op]
+                            or (precedence[op_stack[-1][1]] == precedence[op]
+                                and op != 'NOT'))):
+                    output.append(op_stack.pop())
+                op_stack.append(token)
+            elif kind == 'LP':
+                op_stack.append(token)
+            else:  # RP
+                while op_stack and op_stack[-1][0] != 'LP':
+                    output.append(op_stack.pop())
+                if not op_stack:
+                    raise ValueError("Expression booléenne invalide: parenthèses déséquilibrées")
+                op_stack.pop()  # Retirer la parenthèse ouvrante
+
+        while op_stack:
+            if op_stack[-1][0] == 'LP':
+                raise ValueError("Expression booléenne invalide: parenthèses déséquilibrées")
+            output.append(op_stack.pop())
+
+        return output
+
+    def _eval_rpn(self, rpn: List[tuple]) -> np.ndarray:
+        """
+        Évaluer une expression en RPN sur les listes de postings triées
+
+        Chaque opérande est un tableau int32 trié; les opérateurs utilisent
+        les fusions de listes triées de NumPy.
+        """
+        stack = []
+        for token in rpn:
+            if token[0] == 'TERM':
+                stack.append(self._get_postings_array(token[1]))
+            elif token[1] == 'NOT':
+                if not stack:
+                    raise ValueError("Expression booléenne invalide: NOT sans opérande")
+                operand = stack.pop()
+                stack.append(np.setdiff1d(self._all_docs, operand, assume_unique=True))
+            else:  # AND / OR
+                if len(stack) < 2:
+                    raise ValueError(f"Expression booléenne invalide: {token[1]} sans opérandes")
+                right = stack.pop()
+                left = stack.pop()
+                if token[1] == 'AND':
+                    stack.append(np.intersect1d(left, right, assume_unique=True))
+                else:
+                    stack.append(np.union1d(left, right))
+
+        if len(stack) != 1:
+            raise ValueError("Expression booléenne invalide")
+        return stack[0]
+
     def search_expression(self, query: str) -> Set[int]:
         """
         Rechercher avec une expression booléenne
-        
-        Supporte les opérateurs AND, OR, NOT
+
+        Supporte les opérateurs AND, OR, NOT et les parenthèses imbriquées.
         Exemple: "intelligence AND (artificielle OR machine)"
+        L'expression est tokenisée puis convertie en notation polonaise
+        inverse (algorithme shunting-yard) et évaluée sur les listes de
+        postings — temps linéaire, sans rescans de la chaîne.
         """
-        # Normaliser la requête
-        query = query.upper().strip()
-        
-        # Parser l'expression booléenne (version simplifiée)
-        # Pour une implémentation complète, utiliser un parser d'expressions
-        
-        # Détecter les opérateurs
-        if ' AND ' in query:
-            parts = query.split(' AND ')
-            terms = [p.strip().strip('()') for p in parts]
-            return self.search_and(terms)
-        elif ' OR ' in query:
-            parts = query.split(' OR ')
-            terms = [p.strip().strip('()') for p in parts]
-            return self.search_or(terms)
-        elif query.startswith('NOT '):
-            term = query[4:].strip()
-            return self.search_not(term)
-        else:
-            # Par défaut, recherche AND
-            terms = query.split()
+        tokens = self._tokenize_expression(query.strip())
+        if not tokens:
+            return set()
+
+        # Sans opérateur explicite, recherche AND sur tous les termes (défaut)
+        if not any(token[0] == 'OP' for token in tokens):
+            terms = [token[1] for token in tokens if token[0] == 'TERM']
             return self.search_and(terms)
+
+        result = self._eval_rpn(self._to_rpn(tokens))
+        return set(map(int, result))
     
     def search(self, query: str, processor) -> Set[int]:
         """
@@ -99,15 +249,22 @@ class ModeleBooleen:
         Returns:
             Ensemble des IDs de documents pertinents
         """
-        # Pré-traiter la requête
-        query_terms = processor.preprocess_text(query)
-        
+        # Pré-traiter la requête (ou réutiliser des tokens déjà pré-traités)
+        if isinstance(query, str):
+            query_terms = processor.preprocess_text(query)
+        else:
+            query_terms = list(query)
+
         if not query_terms:
             return set()
         
         # Recherche AND par défaut
         return self.search_and(query_terms)
     
+    def search_tokens(self, tokens: List[str]) -> Set[int]:
+        """Rechercher à partir de tokens déjà pré-traités (sans processor)"""
+        return self.search(tokens, None)
+
     def get_results_ranked(self, query: str, processor) -> List[int]:
         """
         Retourner les résultats (non classés pour le modèle booléen)
@@ -5,120 +5,203 @@ Le modèle de langue estime la probabilité qu'un document ait généré la requ
 en utilisant des modèles de langage unigrammes ou bigrammes.
 """
 
+import heapq
 import math
 from typing import List, Dict, Set, Tuple
 from collections import defaultdict
 import numpy as np
 
+from corpus_statistics import CorpusStatistics, get_corpus_statistics
+
 
 class ModeleLangue:
     """Implémentation du modèle de langue pour la recherche"""
-    
+
     def __init__(self, index_inverse: Dict[str, Set[int]], documents: List[Dict],
-                 lambda_param: float = 0.5):
+                 lambda_param: float = 0.5, stats: CorpusStatistics = None):
         """
         Initialiser le modèle de langue
-        
+
         Args:
             index_inverse: Index inversé {terme: {doc_ids}}
             documents: Liste des documents pré-traités avec leurs tokens
             lambda_param: Paramètre de lissage (mélange document/collection) (défaut: 0.5)
+            stats: Statistiques de corpus déjà construites, partagées avec
+                   d'autres modèles (construites si None)
         """
         self.index = index_inverse
         self.documents = documents
         self.num_docs = len(documents)
         self.lambda_param = lambda_param
-        
-        # Calculer les fréquences dans les documents
-        self.tf = defaultdict(lambda: defaultdict(int))  # tf[doc_id][term] = count
-        self.doc_lengths = {}  # Longueur de chaque document
-        self.collection_tf = defaultdict(int)  # Fréquence totale dans la collection
-        self.collection_length = 0  # Longueur totale de la collection
-        
-        for doc in documents:
-            doc_id = doc['id']
-            tokens = doc['tokens']
-            self.doc_lengths[doc_id] = len(tokens)
-            
-            # Compter les occurrences
-            for token in tokens:
-                self.tf[doc_id][token] += 1
-                self.collection_tf[token] += 1
-                self.collection_length += 1
-        
-        # Probabilité de chaque terme dans la collection
-        self.collection_prob = {}
-        for term, count in self.collection_tf.items():
-            self.collection_prob[term] = count / max(self.collection_length, 1)
-    
+
+        # Statistiques de corpus partagées par référence avec les autres
+        # modèles: vocabulaire, CSR des fréquences, longueurs, fréquences de
+        # collection. Construire les deux modèles sur le même corpus ne
+        # traverse les documents qu'une seule fois.
+        self.stats = stats if stats is not None else get_corpus_statistics(
+            index_inverse, documents)
+        self.vocab = self.stats.vocab
+        self.doc_ids_arr = self.stats.doc_ids_arr
+        self._doc_pos = self.stats.doc_pos
+        self.doc_len = self.stats.doc_len
+        self.tf_indptr = self.stats.tf_indptr
+        self.tf_terms = self.stats.tf_terms
+        self.tf_counts = self.stats.tf_counts
+
+        # Fréquences de collection en SoA: un tableau indexé par terme
+        self.collection_tf = self.stats.collection_tf
+        self.collection_length = self.stats.collection_length
+
+        # Probabilité de chaque terme dans la collection (tableau par terme)
+        self.collection_prob = self.collection_tf / max(self.collection_length, 1)
+
+        # Constantes de lissage indépendantes de la requête, hoistées hors de
+        # la boucle de scoring: (1-λ)*P(term|collection) est recalculé pour
+        # chaque paire (document, terme) sinon
+        self._smoothed_collection = (1 - lambda_param) * self.collection_prob
+
+        # Log-probabilités de fond précalculées: pour un terme absent d'un
+        # document, P(term|d) se réduit à (1-λ)*P(term|collection), qui ne
+        # dépend pas du document. On évite ainsi un math.log10 par
+        # (document, terme) dans la boucle interne de search.
+        with np.errstate(divide='ignore'):
+            self._log_bg = np.where(
+                self.collection_prob > 0,
+                np.log10((1 - lambda_param) * self.collection_prob),
+                math.log10(1e-10)
+            )
+        # Terme hors vocabulaire: probabilité de collection par défaut
+        self._log_bg_default = math.log10(
+            (1 - lambda_param) / max(self.collection_length, 1))
+
+    def _tf_in_doc(self, pos: int, term_id: int) -> int:
+        """
+        Fréquence d'un terme dans un document via recherche dichotomique
+
+        Les termes de chaque document sont triés dans tf_terms, donc un
+        searchsorted sur la tranche CSR du document suffit.
+
+        Args:
+            pos: Position du document dans les tableaux
+            term_id: Identifiant du terme dans le vocabulaire
+
+        Returns:
+            Nombre d'occurrences du terme dans le document (0 si absent)
+        """
+        start, end = self.tf_indptr[pos], self.tf_indptr[pos + 1]
+        idx = np.searchsorted(self.tf_terms[start:end], term_id)
+        if start + idx < end and self.tf_terms[start + idx] == term_id:
+            return int(self.tf_counts[start + idx])
+        return 0
+
     def _compute_term_probability(self, doc_id: int, term: str) -> float:
         """
         Calculer P(term|document) avec lissage de Jelinek-Mercer
-        
+
         P(term|d) = λ * P(term|d) + (1-λ) * P(term|collection)
         """
+        pos = self._doc_pos[doc_id]
+        term_id = self.vocab.get(term)
+
         # Probabilité dans le document
-        doc_length = self.doc_lengths[doc_id]
-        if doc_length == 0:
+        doc_length = int(self.doc_len[pos])
+        if doc_length == 0 or term_id is None:
             doc_prob = 0
         else:
-            doc_prob = self.tf[doc_id][term] / doc_length
-        
-        # Probabilité dans la collection
-        collection_prob = self.collection_prob.get(term, 1 / max(self.collection_length, 1))
-        
+            doc_prob = self._tf_in_doc(pos, term_id) / doc_length
+
+        # Probabilité dans la collection, déjà pondérée par (1-λ)
+        if term_id is not None:
+            smoothed_bg = float(self._smoothed_collection[term_id])
+        else:
+            smoothed_bg = (1 - self.lambda_param) / max(self.collection_length, 1)
+
         # Lissage
-        prob = self.lambda_param * doc_prob + (1 - self.lambda_param) * collection_prob
-        
+        prob = self.lambda_param * doc_prob + smoothed_bg
+
         return prob
-    
+
     def search(self, query: str, processor, top_k: int = 10) -> List[Tuple[int, float]]:
         """
         Rechercher avec le modèle de langue
-        
+
         Le score est la probabilité que le document ait généré la requête:
         P(query|document) = ∏ P(term|document) pour chaque terme de la requête
-        
+
         Args:
             query: Requête textuelle
             processor: CorpusProcessor pour pré-traiter la requête
             top_k: Nombre de résultats à retourner
-        
+
         Returns:
             Liste de tuples (doc_id, score) triés par score décroissant
         """
-        # Pré-traiter la requête
-        query_terms = processor.preprocess_text(query)
-        
+        # Pré-traiter la requête (ou réutiliser des tokens déjà pré-traités)
+        if isinstance(query, str):
+            query_terms = processor.preprocess_text(query)
+        else:
+            query_terms = list(query)
+
         if not query_terms:
             return []
-        
-        # Calculer les scores pour chaque document
-        doc_scores = {}
-        
-        for doc in self.documents:
-            doc_id = doc['id']
-            score = 0.0  # Log-probabilité (somme de logs)
-            
-            for term in query_terms:
-                prob = self._compute_term_probability(doc_id, term)
-                if prob > 0:
-                    score += math.log10(prob)
-                else:
-                    # Si probabilité nulle, pénaliser fortement
-                    score += math.log10(1e-10)
-            
-            doc_scores[doc_id] = score
-        
-        # Trier par score décroissant
-        scores = sorted(doc_scores.items(), key=lambda x: x[1], reverse=True)
-        
+
+        # Résoudre les identifiants de termes une seule fois pour la requête
+        term_ids = [self.vocab.get(term) for term in query_terms]
+
+        # Score de fond: celui d'un document ne contenant aucun terme de la
+        # requête. Il est identique pour tous ces documents, donc calculé une
+        # seule fois au lieu d'une boucle sur tout le corpus.
+        background = sum(self._log_bg_default if term_id is None
+                         else float(self._log_bg[term_id])
+                         for term_id in term_ids)
+
+        # Ne parcourir que les documents des listes de postings des termes de
+        # la requête: chaque occurrence remplace le terme de fond correspondant
+        # par le terme lissé complet. Travail en O(somme des postings) au lieu
+        # de O(|documents| * |requête|).
+        adjustments = defaultdict(float)
+        lambda_param = self.lambda_param
+        for term, term_id in zip(query_terms, term_ids):
+            if term_id is None:
+                continue
+            log_bg = float(self._log_bg[term_id])
+            smoothed_bg = float(self._smoothed_collection[term_id])
+            for doc_id in self.index.get(term, ()):
+                pos = self._doc_pos[doc_id]
+                doc_length = int(self.doc_len[pos])
+                if doc_length == 0:
+                    continue
+                tf = self._tf_in_doc(pos, term_id)
+                if tf > 0:
+                    prob = lambda_param * tf / doc_length + smoothed_bg
+                    adjustments[doc_id] += math.log10(prob) - log_bg
+
+        # Les ajustements sont toujours positifs, donc les documents candidats
+        # dominent les documents au score de fond
+        doc_scores = {doc_id: background + adj for doc_id, adj in adjustments.items()}
+
+        # Sélectionner les top_k par tas plutôt qu'un tri complet:
+        # O(D log k) au lieu de O(D log D)
+        scores = heapq.nlargest(top_k, doc_scores.items(), key=lambda x: x[1])
+
+        # Compléter avec des documents au score de fond si moins de top_k candidats
+        if len(scores) < top_k:
+            for doc_id in self.doc_ids_arr:
+                if len(scores) >= top_k:
+                    break
+                doc_id = int(doc_id)
+                if doc_id not in adjustments:
+                    scores.append((doc_id, background))
+
         # Retourner les top_k résultats
         return scores[:top_k]
-    
+
+    def search_tokens(self, tokens: List[str], top_k: int = 10) -> List[Tuple[int, float]]:
+        """Rechercher à partir de tokens déjà pré-traités (sans processor)"""
+        return self.search(tokens, None, top_k)
+
     def get_results_ranked(self, query: str, processor, top_k: int = 10) -> List[int]:
         """Retourner les IDs de documents classés par pertinence"""
         results = self.search(query, processor, top_k)
         # Les scores sont des log-probabilités (négatifs), on retourne tous les résultats
         return [doc_id for doc_id, score in results]
-
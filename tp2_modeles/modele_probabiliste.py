@@ -5,118 +5,188 @@ Le modèle probabiliste BM25 (Best Matching 25) est une amélioration du modèle
 probabiliste classique qui prend en compte la longueur des documents.
 """
 
-import math
 from typing import List, Dict, Set, Tuple
-from collections import defaultdict
 import numpy as np
 
+from corpus_statistics import CorpusStatistics, get_corpus_statistics
+
+from _bm25_numba import NUMBA_AVAILABLE
+if NUMBA_AVAILABLE:
+    from _bm25_numba import bm25_score_kernel
+
 
 class ModeleProbabiliste:
     """Implémentation du modèle probabiliste BM25"""
-    
+
     def __init__(self, index_inverse: Dict[str, Set[int]], documents: List[Dict],
-                 k1: float = 1.5, b: float = 0.75):
+                 k1: float = 1.5, b: float = 0.75, stats: CorpusStatistics = None):
         """
         Initialiser le modèle probabiliste BM25
-        
+
         Args:
             index_inverse: Index inversé {terme: {doc_ids}}
             documents: Liste des documents pré-traités avec leurs tokens
             k1: Paramètre de saturation de la fréquence de terme (défaut: 1.5)
             b: Paramètre de normalisation de la longueur (défaut: 0.75)
+            stats: Statistiques de corpus déjà construites, partagées avec
+                   d'autres modèles (construites si None)
         """
         self.index = index_inverse
         self.documents = documents
         self.num_docs = len(documents)
         self.k1 = k1
         self.b = b
-        
-        # Calculer les fréquences et longueurs
-        self.tf = defaultdict(lambda: defaultdict(int))  # tf[doc_id][term] = count
-        self.df = defaultdict(int)  # df[term] = nombre de documents contenant le terme
-        self.doc_lengths = {}  # Longueur de chaque document (nombre de termes)
-        
-        for doc in documents:
-            doc_id = doc['id']
-            tokens = doc['tokens']
-            self.doc_lengths[doc_id] = len(tokens)
-            
-            # Compter les occurrences
-            for token in tokens:
-                self.tf[doc_id][token] += 1
-                if self.tf[doc_id][token] == 1:
-                    self.df[token] += 1
-        
-        # Longueur moyenne des documents
-        if self.doc_lengths:
-            self.avg_doc_length = sum(self.doc_lengths.values()) / len(self.doc_lengths)
-        else:
-            self.avg_doc_length = 0
-    
-    def _compute_idf(self, term: str) -> float:
-        """Calculer l'IDF pour un terme"""
-        if self.df[term] == 0:
-            return 0
-        return math.log10((self.num_docs - self.df[term] + 0.5) / (self.df[term] + 0.5))
-    
+
+        # Statistiques de corpus partagées par référence avec les autres
+        # modèles: vocabulaire, CSR des fréquences, df, longueurs, postings.
+        # Construire les deux modèles sur le même corpus ne traverse les
+        # documents qu'une seule fois.
+        self.stats = stats if stats is not None else get_corpus_statistics(
+            index_inverse, documents)
+        self.vocab = self.stats.vocab
+        self.df = self.stats.df
+        self.doc_ids_arr = self.stats.doc_ids_arr
+        self._doc_pos = self.stats.doc_pos
+        self.doc_len = self.stats.doc_len
+        self.tf_indptr = self.stats.tf_indptr
+        self.tf_terms = self.stats.tf_terms
+        self.tf_counts = self.stats.tf_counts
+        self.avg_doc_length = self.stats.avg_doc_length
+        self.postings = self.stats.postings
+
+        # Structures vectorisées pour le scoring BM25
+        # Au lieu de recalculer IDF et normalisation par (document, terme) dans
+        # des boucles Python, on précalcule des tableaux NumPy: le score d'une
+        # requête devient quelques opérations vectorisées par terme.
+        self._build_vectorized_structures()
+
+    def _build_vectorized_structures(self):
+        """
+        Construire les structures NumPy précalculées pour la recherche
+
+        - idf : IDF de chaque terme du vocabulaire (tableau indexé par terme)
+        - len_norm : dénominateur de normalisation k1*(1-b + b*|d|/avgdl)
+
+        Les listes de postings viennent des statistiques de corpus partagées.
+        """
+        # Normalisation BM25 (constante par document)
+        avgdl = max(self.avg_doc_length, 1)
+        self.len_norm = (self.k1 * (1 - self.b
+                                    + self.b * self.doc_len.astype(np.float32) / avgdl))
+
+        # IDF précalculé par terme
+        df_arr = np.array([self.df.get(term, 0) for term in self.vocab], dtype=np.float64)
+        with np.errstate(divide='ignore'):
+            self.idf = np.where(
+                df_arr > 0,
+                np.log10((self.num_docs - df_arr + 0.5) / (df_arr + 0.5)),
+                0.0
+            )
+
+    def _tf_in_doc(self, pos: int, term_id: int) -> int:
+        """
+        Fréquence d'un terme dans un document via recherche dichotomique
+
+        Les termes de chaque document sont triés dans tf_terms, donc un
+        searchsorted sur la tranche CSR du document suffit.
+
+        Args:
+            pos: Position du document dans les tableaux
+            term_id: Identifiant du terme dans le vocabulaire
+
+        Returns:
+            Nombre d'occurrences du terme dans le document (0 si absent)
+        """
+        start, end = self.tf_indptr[pos], self.tf_indptr[pos + 1]
+        idx = np.searchsorted(self.tf_terms[start:end], term_id)
+        if start + idx < end and self.tf_terms[start + idx] == term_id:
+            return int(self.tf_counts[start + idx])
+        return 0
+
     def _compute_bm25_score(self, doc_id: int, term: str) -> float:
         """Calculer le score BM25 pour un terme dans un document"""
-        if term not in self.tf[doc_id]:
+        term_id = self.vocab.get(term)
+        if term_id is None:
+            return 0
+
+        pos = self._doc_pos[doc_id]
+        tf = self._tf_in_doc(pos, term_id)
+        if tf == 0:
             return 0
-        
-        # Fréquence du terme dans le document
-        tf = self.tf[doc_id][term]
-        
-        # Longueur du document
-        doc_length = self.doc_lengths[doc_id]
-        
-        # IDF
-        idf = self._compute_idf(term)
-        
+
         # Score BM25
         # BM25(t, d) = IDF(t) * (tf(t,d) * (k1 + 1)) / (tf(t,d) + k1 * (1 - b + b * |d|/avgdl))
         numerator = tf * (self.k1 + 1)
-        denominator = tf + self.k1 * (1 - self.b + self.b * (doc_length / max(self.avg_doc_length, 1)))
-        
-        score = idf * (numerator / denominator)
-        return score
-    
+        denominator = tf + self.len_norm[pos]
+
+        return float(self.idf[term_id] * (numerator / denominator))
+
     def search(self, query: str, processor, top_k: int = 10) -> List[Tuple[int, float]]:
         """
         Rechercher avec le modèle probabiliste BM25
-        
+
         Args:
             query: Requête textuelle
             processor: CorpusProcessor pour pré-traiter la requête
             top_k: Nombre de résultats à retourner
-        
+
         Returns:
             Liste de tuples (doc_id, score) triés par score décroissant
         """
-        # Pré-traiter la requête
-        query_terms = processor.preprocess_text(query)
-        
+        # Pré-traiter la requête (ou réutiliser des tokens déjà pré-traités)
+        if isinstance(query, str):
+            query_terms = processor.preprocess_text(query)
+        else:
+            query_terms = list(query)
+
         if not query_terms:
             return []
-        
-        # Calculer les scores BM25 pour chaque document
-        doc_scores = defaultdict(float)
-        
-        for term in query_terms:
-            if term in self.index:
-                # Pour chaque document contenant le terme
-                for doc_id in self.index[term]:
-                    score = self._compute_bm25_score(doc_id, term)
-                    doc_scores[doc_id] += score
-        
-        # Trier par score décroissant
-        scores = sorted(doc_scores.items(), key=lambda x: x[1], reverse=True)
-        
-        # Retourner les top_k résultats
-        return scores[:top_k]
-    
+
+        scores = np.zeros(self.num_docs, dtype=np.float64)
+        touched = np.zeros(self.num_docs, dtype=bool)
+
+        if NUMBA_AVAILABLE:
+            # Noyau JIT: une seule passe parallèle sur les non-zéros CSR,
+            # sans tableaux temporaires NumPy. Les poids comptent les
+            # occurrences de chaque terme dans la requête — mêmes scores
+            # que le chemin NumPy pour une requête avec termes répétés
+            query_weight = np.zeros(len(self.vocab), dtype=np.float64)
+            for term in query_terms:
+                term_id = self.vocab.get(term)
+                if term_id is not None:
+                    query_weight[term_id] += 1.0
+            bm25_score_kernel(self.tf_indptr, self.tf_terms, self.tf_counts,
+                              self.idf, self.len_norm, query_weight,
+                              self.k1, scores, touched)
+        else:
+            # Chemin NumPy vectorisé: pour chaque terme de la requête,
+            # une seule opération sur sa liste de postings
+            for term in query_terms:
+                if term in self.postings:
+                    rows, tfs = self.postings[term]
+                    idf = self.idf[self.vocab[term]]
+                    # BM25(t, d) = IDF(t) * (tf * (k1+1)) / (tf + k1*(1-b + b*|d|/avgdl))
+                    scores[rows] += idf * tfs * (self.k1 + 1) / (tfs + self.len_norm[rows])
+                    touched[rows] = True
+
+        # Ne garder que les documents contenant au moins un terme de la requête
+        candidates = np.nonzero(touched)[0]
+        if candidates.size == 0:
+            return []
+
+        # Sélection des top_k par argpartition (évite le tri complet)
+        if candidates.size > top_k:
+            best = np.argpartition(-scores[candidates], top_k)[:top_k]
+            candidates = candidates[best]
+        order = candidates[np.argsort(-scores[candidates])]
+
+        return [(int(self.doc_ids_arr[pos]), float(scores[pos])) for pos in order]
+
+    def search_tokens(self, tokens: List[str], top_k: int = 10) -> List[Tuple[int, float]]:
+        """Rechercher à partir de tokens déjà pré-traités (sans processor)"""
+        return self.search(tokens, None, top_k)
+
     def get_results_ranked(self, query: str, processor, top_k: int = 10) -> List[int]:
         """Retourner les IDs de documents classés par pertinence"""
         results = self.search(query, processor, top_k)
         return [doc_id for doc_id, score in results if score > 0]
-
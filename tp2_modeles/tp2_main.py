@@ -6,6 +6,13 @@ Utilise LLM as a Judge pour évaluer les différents modèles
 import os
 import sys
 import json
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 from typing import List, Dict
 
 # Ajouter le chemin du TP1 pour importer les classes
@@ -16,15 +23,25 @@ from modele_booleen import ModeleBooleen
 from modele_vectoriel import ModeleVectoriel
 from modele_probabiliste import ModeleProbabiliste
 from modele_langue import ModeleLangue
+from corpus_statistics import CorpusStatistics
 from llm_judge import LLMJudge
 
 
-def create_corpus_tp2(num_docs=50):
-    """Créer un corpus pour le TP2 avec plusieurs domaines distincts"""
+def create_corpus_tp2(num_docs=50, persist=False):
+    """
+    Créer un corpus pour le TP2 avec plusieurs domaines distincts
+
+    Args:
+        num_docs: Nombre de documents à générer
+        persist: Écrire aussi chaque document sur disque (désactivé par
+                 défaut: le pipeline ne lit que les textes en mémoire, et
+                 ouvrir/fermer 50 petits fichiers coûte surtout des syscalls)
+    """
     # Créer le corpus dans un dossier spécifique pour le TP2
     original_dir = os.getcwd()
     corpus_dir = 'corpus_tp2'
-    os.makedirs(corpus_dir, exist_ok=True)
+    if persist:
+        os.makedirs(corpus_dir, exist_ok=True)
     
     processor = CorpusProcessor(language='french')
     
@@ -156,13 +173,18 @@ def create_corpus_tp2(num_docs=50):
             if doc_id > num_docs:
                 break
     
-    # Sauvegarder les documents
-    for doc in all_documents:
-        with open(doc['filename'], 'w', encoding='utf-8') as f:
-            f.write(doc['text'])
+    # Sauvegarder les documents seulement sur demande, avec un tampon
+    # d'écriture large pour limiter les appels système par fichier
+    if persist:
+        for doc in all_documents:
+            with open(doc['filename'], 'w', encoding='utf-8', buffering=1 << 16) as f:
+                f.write(doc['text'])
     
     processor.documents = all_documents
-    print(f"✓ Corpus créé: {len(all_documents)} documents dans '{corpus_dir}/'")
+    if persist:
+        print(f"✓ Corpus créé: {len(all_documents)} documents dans '{corpus_dir}/'")
+    else:
+        print(f"✓ Corpus créé: {len(all_documents)} documents (en mémoire)")
     print(f"  Domaines: {', '.join(set(d['domain'] for d in all_documents))}")
     
     return processor, all_documents
@@ -176,23 +198,57 @@ def build_all_models(processor: CorpusProcessor, documents: List[Dict]):
     # Construire l'index inversé
     index = InvertedIndex()
     index.build_index(processed_docs)
-    
+
+    # Statistiques de corpus construites une seule fois et partagées entre
+    # les modèles probabiliste et de langue (une traversée du corpus au lieu
+    # d'une par modèle)
+    stats = CorpusStatistics(index.index, processed_docs)
+
     # Créer les modèles
     models = {
         'Booléen': ModeleBooleen(index.index),
-        'Vectoriel': ModeleVectoriel(index.index, processed_docs),
-        'Probabiliste (BM25)': ModeleProbabiliste(index.index, processed_docs),
-        'Langue': ModeleLangue(index.index, processed_docs)
+        'Vectoriel': ModeleVectoriel(index.index, processed_docs, stats=stats),
+        'Probabiliste (BM25)': ModeleProbabiliste(index.index, processed_docs, stats=stats),
+        'Langue': ModeleLangue(index.index, processed_docs, stats=stats)
     }
     
     return models, processed_docs
 
 
-def test_queries(models: Dict, processor: CorpusProcessor, 
+# Cache des requêtes pré-traitées: le pipeline NLTK (tokenisation, stopwords,
+# stemming) est coûteux et chaque requête est soumise aux quatre modèles —
+# sans cache, il est relancé quatre fois sur le même texte
+_query_tokens_cache: Dict[str, tuple] = {}
+
+
+def preprocess_query_cached(processor: CorpusProcessor, query: str) -> tuple:
+    """Pré-traiter une requête une seule fois et mémoriser les tokens"""
+    tokens = _query_tokens_cache.get(query)
+    if tokens is None:
+        tokens = tuple(processor.preprocess_text(query))
+        _query_tokens_cache[query] = tokens
+    return tokens
+
+
+def test_queries(models: Dict, processor: CorpusProcessor,
                 processed_docs: List[Dict], queries: List[str]):
     """Tester les modèles avec différentes requêtes"""
     results = {}
-    
+
+    # Un seul pool de threads pour toute la session de test: les threads
+    # sont réutilisés d'une requête à l'autre au lieu d'être recréés (et
+    # détruits) à chaque itération
+    executor = ThreadPoolExecutor(max_workers=len(models))
+
+    # Le modèle vectoriel traite toutes les requêtes d'un coup: un seul GEMM
+    # batché streame la matrice des documents une fois pour toutes les requêtes
+    vector_batch = {}
+    vector_model = models.get('Vectoriel')
+    if vector_model is not None and hasattr(vector_model, 'search_batch'):
+        all_tokens = [preprocess_query_cached(processor, q) for q in queries]
+        batch_results = vector_model.search_batch(all_tokens, processor, top_k=10)
+        vector_batch = dict(zip(queries, batch_results))
+
     for query in queries:
         print(f"\n{'='*60}")
         print(f"REQUÊTE: '{query}'")
@@ -200,17 +256,35 @@ def test_queries(models: Dict, processor: CorpusProcessor,
         
         query_results = {}
         query_scores = {}  # Stocker les scores pour chaque modèle
-        
-        # Tester chaque modèle
+
+        # Pré-traiter la requête une seule fois, partagé entre les modèles
+        query_tokens = preprocess_query_cached(processor, query)
+
+        # Lancer les quatre recherches en parallèle: les rankers NumPy
+        # relâchent le GIL dans leurs opérations vectorisées, donc les
+        # threads s'exécutent réellement en parallèle
+        futures = {
+            model_name: (executor.submit(model.search_tokens, query_tokens)
+                         if model_name == 'Booléen'
+                         else executor.submit(model.search_tokens, query_tokens, 10))
+            for model_name, model in models.items()
+            if not (model_name == 'Vectoriel' and query in vector_batch)
+        }
+
+        # Collecter et afficher les résultats de chaque modèle
         for model_name, model in models.items():
             try:
                 if model_name == 'Booléen':
-                    doc_ids = model.search(query, processor)
+                    doc_ids = futures[model_name].result()
                     ranked_results = sorted(list(doc_ids))
                     scores = {doc_id: 1.0 for doc_id in ranked_results}  # Score binaire
                 else:
-                    # Récupérer les résultats avec scores
-                    scored_results = model.search(query, processor, top_k=10)
+                    if model_name == 'Vectoriel' and query in vector_batch:
+                        # Résultats déjà calculés par le GEMM batché
+                        scored_results = vector_batch[query]
+                    else:
+                        # Récupérer les résultats avec scores
+                        scored_results = futures[model_name].result()
                     # Le modèle de langue retourne des log-probabilités (négatives)
                     # Il faut donc ne pas filtrer par score > 0 pour ce modèle
                     if model_name == 'Langue':
@@ -240,7 +314,9 @@ def test_queries(models: Dict, processor: CorpusProcessor,
             'results': query_results,
             'scores': query_scores
         }
-    
+
+    executor.shutdown()
+
     return results
 
 
@@ -341,9 +417,15 @@ def generate_comparison_report(evaluations: Dict):
         avg_results = stats['total_results'] / max(stats['num_queries'], 1)
         print(f"{model_name:<25} {avg_score:<15.2f} {avg_results:<15.1f} {stats['wins']:<10}")
     
-    # Sauvegarder les résultats
-    with open('evaluations_llm.json', 'w', encoding='utf-8') as f:
-        json.dump(evaluations, f, indent=2, ensure_ascii=False)
+    # Sauvegarder les résultats: orjson (implémenté en C, sortie UTF-8
+    # native) sérialise tout le dictionnaire d'un coup bien plus vite que
+    # json.dump, qui paie cher l'indentation en Python pur
+    if ORJSON_AVAILABLE:
+        with open('evaluations_llm.json', 'wb') as f:
+            f.write(orjson.dumps(evaluations, option=orjson.OPT_INDENT_2))
+    else:
+        with open('evaluations_llm.json', 'w', encoding='utf-8') as f:
+            json.dump(evaluations, f, indent=2, ensure_ascii=False)
     
     print("\n✓ Évaluations sauvegardées dans 'evaluations_llm.json'")
 
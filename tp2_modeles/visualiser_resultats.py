@@ -2,121 +2,190 @@
 Script pour visualiser les résultats de comparaison des modèles
 """
 
+import functools
+import heapq
 import json
-from typing import Dict, List
+import os
+import sys
+from operator import itemgetter
+from typing import Dict, Iterator, List, Tuple
+
+# ijson parse le JSON en flux: on itère sur les paires (requête, évaluation)
+# au fil de la lecture du fichier au lieu de matérialiser tout l'arbre de
+# dictionnaires en mémoire. Sans le paquet, on retombe sur json.load.
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Sans ijson, le repli charge tout le fichier: autant le parser avec orjson
+# (tokenizer Rust, 2-5x plus rapide que le module json) quand il est installé
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Gabarit de ligne du tableau de statistiques, compilé une fois au chargement
+# du module au lieu de re-parser le format à chaque ligne
+_STATS_ROW = "{:<25} {:<15.2f} {:<15.1f} {:<10} {:<15.2f}".format
+
+
+def _coerce_scores(eval_data: Dict) -> Dict:
+    """Convertir les scores du juge en float une fois pour toutes à la lecture"""
+    for model_eval in eval_data.get('evaluations', {}).values():
+        scores = model_eval.get('scores')
+        if scores:
+            model_eval['scores'] = {doc_id: float(score) for doc_id, score in scores.items()}
+    return eval_data
+
+
+def iter_evaluations(filename='evaluations_llm.json') -> Iterator[Tuple[str, Dict]]:
+    """Itérer sur les paires (requête, évaluation) sans charger tout le fichier"""
+    # Fichier vide ou réduit à '{}': rien à parser du tout
+    if os.path.getsize(filename) < 3:
+        return
+    with open(filename, 'r', encoding='utf-8') as f:
+        if IJSON_AVAILABLE:
+            pairs = ijson.kvitems(f, '')
+        elif ORJSON_AVAILABLE:
+            pairs = orjson.loads(f.read()).items()
+        else:
+            pairs = json.load(f).items()
+        for query, eval_data in pairs:
+            yield query, _coerce_scores(eval_data)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_cached(filename: str, mtime_ns: int) -> Dict:
+    return dict(iter_evaluations(filename))
 
 
 def load_evaluations(filename='evaluations_llm.json'):
-    """Charger les évaluations"""
+    """Charger les évaluations (mémoïsé sur (fichier, mtime))"""
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        st = os.stat(filename)
     except FileNotFoundError:
         print(f"Fichier {filename} non trouvé. Exécutez d'abord tp2_main.py")
         return None
+    if st.st_size < 3:
+        return {}
+    return _load_cached(filename, st.st_mtime_ns)
 
 
-def display_detailed_comparison(evaluations: Dict):
-    """Afficher une comparaison détaillée"""
-    print("=" * 80)
-    print("COMPARAISON DÉTAILLÉE DES MODÈLES")
-    print("=" * 80)
-    
-    for query, eval_data in evaluations.items():
-        print(f"\n{'='*80}")
-        print(f"REQUÊTE: '{query}'")
-        print('='*80)
-        
-        # Afficher les résultats par modèle
-        print("\n📋 RÉSULTATS PAR MODÈLE:")
-        print("-" * 80)
-        
-        results = eval_data.get('evaluations', {})
-        for model_name, model_eval in results.items():
-            scores = model_eval.get('scores', {})
-            mean_score = model_eval.get('score_moyen', 0)
-            justification = model_eval.get('justification', '')
-            
-            print(f"\n{model_name}:")
-            print(f"  Score moyen: {mean_score:.2f}/10")
-            print(f"  Documents retournés: {len(scores)}")
-            if scores:
-                print(f"  Scores individuels:")
-                for doc_id, score in sorted(scores.items(), key=lambda x: float(x[1]), reverse=True)[:5]:
-                    print(f"    Doc {doc_id}: {float(score):.2f}/10")
-                if len(scores) > 5:
-                    print(f"    ... et {len(scores) - 5} autres")
-            if justification:
-                print(f"  Justification: {justification[:100]}...")
-        
-        # Afficher la comparaison
-        comparison = eval_data.get('comparaison', {})
-        best_model = comparison.get('meilleur_modele', 'N/A')
-        justification = comparison.get('justification', '')
-        
-        print(f"\n🏆 MEILLEUR MODÈLE: {best_model}")
+def display_query_comparison(query: str, eval_data: Dict, out: List[str]):
+    """Afficher la comparaison détaillée d'une requête"""
+    out.append(f"\n{'='*80}")
+    out.append(f"REQUÊTE: '{query}'")
+    out.append('='*80)
+
+    # Afficher les résultats par modèle
+    out.append("\n📋 RÉSULTATS PAR MODÈLE:")
+    out.append("-" * 80)
+
+    results = eval_data.get('evaluations', {})
+    for model_name, model_eval in results.items():
+        scores = model_eval.get('scores', {})
+        mean_score = model_eval.get('score_moyen', 0)
+        justification = model_eval.get('justification', '')
+
+        out.append(f"\n{model_name}:")
+        out.append(f"  Score moyen: {mean_score:.2f}/10")
+        out.append(f"  Documents retournés: {len(scores)}")
+        if scores:
+            out.append(f"  Scores individuels:")
+            # Sélection partielle O(n log 5) plutôt que tri complet O(n log n);
+            # les scores sont déjà des float depuis iter_evaluations
+            for doc_id, score in heapq.nlargest(5, scores.items(), key=itemgetter(1)):
+                out.append(f"    Doc {doc_id}: {score:.2f}/10")
+            if len(scores) > 5:
+                out.append(f"    ... et {len(scores) - 5} autres")
         if justification:
-            print(f"   Justification: {justification}")
+            out.append(f"  Justification: {justification[:100]}...")
 
+    # Afficher la comparaison
+    comparison = eval_data.get('comparaison', {})
+    best_model = comparison.get('meilleur_modele', 'N/A')
+    justification = comparison.get('justification', '')
+
+    out.append(f"\n🏆 MEILLEUR MODÈLE: {best_model}")
+    if justification:
+        out.append(f"   Justification: {justification}")
+
+
+def accumulate_statistics(model_stats: Dict, eval_data: Dict):
+    """Accumuler les statistiques globales pour une requête"""
+    metrics = eval_data.get('metrics', {})
+    best_model = eval_data.get('best_model')
+
+    # Réductions courantes (sommes + compteur) plutôt que des listes par
+    # requête: pas d'allocation O(N) juste pour une moyenne calculée une fois
+    for model_name, model_metrics in metrics.items():
+        if model_name not in model_stats:
+            model_stats[model_name] = {
+                'total_score': 0.0,
+                'total_results': 0,
+                'max_score_sum': 0.0,
+                'num_queries': 0,
+                'wins': 0
+            }
+
+        # Liaisons locales pour éviter de re-hacher model_name et de
+        # re-résoudre .get à chaque métrique
+        stats = model_stats[model_name]
+        mget = model_metrics.get
+        stats['total_score'] += mget('mean_score', 0)
+        stats['total_results'] += mget('num_results', 0)
+        stats['max_score_sum'] += mget('max_score', 0)
+        stats['num_queries'] += 1
+
+        if best_model == model_name:
+            stats['wins'] += 1
+
+
+def display_statistics(model_stats: Dict, num_queries: int, out: List[str]):
+    """Afficher les statistiques globales accumulées"""
+    out.append("\n" + "=" * 80)
+    out.append("STATISTIQUES GLOBALES")
+    out.append("=" * 80)
 
-def display_statistics(evaluations: Dict):
-    """Afficher les statistiques globales"""
-    print("\n" + "=" * 80)
-    print("STATISTIQUES GLOBALES")
-    print("=" * 80)
-    
-    model_stats = {}
-    
-    for query, eval_data in evaluations.items():
-        metrics = eval_data.get('metrics', {})
-        best_model = eval_data.get('best_model')
-        
-        for model_name, model_metrics in metrics.items():
-            if model_name not in model_stats:
-                model_stats[model_name] = {
-                    'total_score': 0,
-                    'num_queries': 0,
-                    'total_results': 0,
-                    'wins': 0,
-                    'max_scores': []
-                }
-            
-            model_stats[model_name]['total_score'] += model_metrics.get('mean_score', 0)
-            model_stats[model_name]['num_queries'] += 1
-            model_stats[model_name]['total_results'] += model_metrics.get('num_results', 0)
-            model_stats[model_name]['max_scores'].append(model_metrics.get('max_score', 0))
-            
-            if best_model == model_name:
-                model_stats[model_name]['wins'] += 1
-    
     # Afficher le tableau
-    print(f"\n{'Modèle':<25} {'Score Moyen':<15} {'Résultats/Q':<15} {'Victoires':<10} {'Score Max Moyen':<15}")
-    print("-" * 80)
+    out.append(f"\n{'Modèle':<25} {'Score Moyen':<15} {'Résultats/Q':<15} {'Victoires':<10} {'Score Max Moyen':<15}")
+    out.append("-" * 80)
     
+    # Le meilleur modèle global est suivi au fil de la boucle d'affichage:
+    # pas de second parcours max() sur model_stats
+    best_name = None
+    best_key = (-1, -1.0)
+    best_wins = 0
+    best_avg = 0.0
     for model_name, stats in sorted(model_stats.items(), key=lambda x: x[1]['wins'], reverse=True):
-        avg_score = stats['total_score'] / max(stats['num_queries'], 1)
-        avg_results = stats['total_results'] / max(stats['num_queries'], 1)
-        avg_max_score = sum(stats['max_scores']) / max(len(stats['max_scores']), 1)
-        
-        print(f"{model_name:<25} {avg_score:<15.2f} {avg_results:<15.1f} {stats['wins']:<10} {avg_max_score:<15.2f}")
-    
-    # Identifier le meilleur modèle global
-    best_overall = max(model_stats.items(), key=lambda x: (
-        x[1]['wins'],
-        x[1]['total_score'] / max(x[1]['num_queries'], 1)
-    ))
-    
-    print(f"\n🏆 MEILLEUR MODÈLE GLOBAL: {best_overall[0]}")
-    print(f"   Victoires: {best_overall[1]['wins']}/{len(evaluations)} requêtes")
-    print(f"   Score moyen: {best_overall[1]['total_score'] / max(best_overall[1]['num_queries'], 1):.2f}/10")
+        n = max(stats['num_queries'], 1)
+        avg_score = stats['total_score'] / n
+        avg_results = stats['total_results'] / n
+        avg_max_score = stats['max_score_sum'] / n
 
+        out.append(_STATS_ROW(model_name, avg_score, avg_results, stats['wins'], avg_max_score))
 
-def display_model_characteristics():
+        if (stats['wins'], avg_score) > best_key:
+            best_key = (stats['wins'], avg_score)
+            best_name = model_name
+            best_wins = stats['wins']
+            best_avg = avg_score
+
+    out.append(f"\n🏆 MEILLEUR MODÈLE GLOBAL: {best_name}")
+    out.append(f"   Victoires: {best_wins}/{num_queries} requêtes")
+    out.append(f"   Score moyen: {best_avg:.2f}/10")
+
+
+def display_model_characteristics(out: List[str]):
     """Afficher les caractéristiques de chaque modèle"""
-    print("\n" + "=" * 80)
-    print("CARACTÉRISTIQUES DES MODÈLES")
-    print("=" * 80)
-    
+    out.append(_CHARACTERISTICS_TEXT)
+
+
+def _build_characteristics_text() -> str:
+    """Formater le texte statique des caractéristiques (une fois, à l'import)"""
     characteristics = {
         'Booléen': {
             'Avantages': [
@@ -171,37 +240,64 @@ def display_model_characteristics():
             'Meilleur pour': 'Recherche dans domaines spécialisés'
         }
     }
-    
+
+    lines = ["\n" + "=" * 80, "CARACTÉRISTIQUES DES MODÈLES", "=" * 80]
     for model_name, chars in characteristics.items():
-        print(f"\n{model_name}:")
-        print(f"  Avantages:")
+        lines.append(f"\n{model_name}:")
+        lines.append(f"  Avantages:")
         for adv in chars['Avantages']:
-            print(f"    • {adv}")
-        print(f"  Inconvénients:")
+            lines.append(f"    • {adv}")
+        lines.append(f"  Inconvénients:")
         for disadv in chars['Inconvénients']:
-            print(f"    • {disadv}")
-        print(f"  Meilleur pour: {chars['Meilleur pour']}")
+            lines.append(f"    • {disadv}")
+        lines.append(f"  Meilleur pour: {chars['Meilleur pour']}")
+    return "\n".join(lines)
+
+
+# Texte entièrement statique: formaté une seule fois au chargement du module
+_CHARACTERISTICS_TEXT = _build_characteristics_text()
 
 
 def main():
     """Fonction principale"""
-    evaluations = load_evaluations()
-    
-    if not evaluations:
+    # Les lignes sont accumulées puis écrites en un seul write: un appel
+    # système au lieu d'un par print()
+    out = []
+    out.append("=" * 80)
+    out.append("COMPARAISON DÉTAILLÉE DES MODÈLES")
+    out.append("=" * 80)
+
+    # Une seule traversée du fichier: affichage détaillé et accumulation
+    # des statistiques sont fusionnés pour que le flux ne soit lu qu'une fois
+    model_stats = {}
+    num_queries = 0
+    try:
+        for query, eval_data in iter_evaluations():
+            display_query_comparison(query, eval_data, out)
+            accumulate_statistics(model_stats, eval_data)
+            num_queries += 1
+    except FileNotFoundError:
+        print("Fichier evaluations_llm.json non trouvé. Exécutez d'abord tp2_main.py")
         return
-    
-    # Afficher la comparaison détaillée
-    display_detailed_comparison(evaluations)
-    
+
+    if num_queries == 0:
+        print("Aucune évaluation à afficher dans evaluations_llm.json")
+        return
+
+    if not model_stats:
+        return
+
     # Afficher les statistiques
-    display_statistics(evaluations)
-    
+    display_statistics(model_stats, num_queries, out)
+
     # Afficher les caractéristiques
-    display_model_characteristics()
-    
-    print("\n" + "=" * 80)
-    print("Analyse terminée!")
-    print("=" * 80)
+    display_model_characteristics(out)
+
+    out.append("\n" + "=" * 80)
+    out.append("Analyse terminée!")
+    out.append("=" * 80)
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,125 @@
+"""
+Noyau de construction d'index inversé compilé avec Numba (optionnel)
+
+La boucle interne de InvertedIndex.build_index — insertion de chaque paire
+(terme, doc_id) dans un defaultdict(set) — est du pur bytecode CPython. Ce
+module fournit un noyau JIT équivalent : les tokens sont d'abord mappés vers
+des identifiants entiers contigus côté Python, puis le noyau construit les
+listes de postings au format CSR (tri par comptage en deux passes) sur des
+tableaux int32, sans objet Python dans la boucle chaude.
+
+Numba n'est pas une dépendance obligatoire du TP : si le paquet n'est pas
+installé, NUMBA_AVAILABLE vaut False et seul le chemin Python est mesuré.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def build_postings_kernel(token_ids, doc_ids, num_terms):
+        """
+        Construire les postings CSR d'un index inversé par tri par comptage
+
+        Args:
+            token_ids: Identifiants de termes du flux aplati (int32[n])
+            doc_ids: Identifiants de documents parallèles (int32[n])
+            num_terms: Taille du vocabulaire
+
+        Returns:
+            tuple: (indptr, postings) où postings[indptr[t]:indptr[t+1]]
+                   contient les doc_ids du terme t
+        """
+        # Première passe : compter les occurrences par terme
+        counts = np.zeros(num_terms + 1, dtype=np.int64)
+        for k in range(token_ids.size):
+            counts[token_ids[k] + 1] += 1
+
+        # Délimiteurs par somme cumulée
+        indptr = np.cumsum(counts)
+
+        # Seconde passe : disperser les doc_ids dans leur segment
+        fill = indptr[:-1].copy()
+        postings = np.empty(token_ids.size, dtype=np.int32)
+        for k in range(token_ids.size):
+            term = token_ids[k]
+            postings[fill[term]] = doc_ids[k]
+            fill[term] += 1
+        return indptr, postings
+
+    @njit(cache=True)
+    def intersect_sorted_kernel(a, b):
+        """
+        Intersection de deux tableaux int32 triés (fusion à deux pointeurs)
+
+        Équivalent compilé de la fusion Python de partie1 : la boucle ne
+        manipule que des entiers machine sur des tableaux contigus, sans
+        aucun objet Python dans le chemin chaud.
+
+        Args:
+            a: Premier tableau trié (int32, éléments uniques)
+            b: Second tableau trié (int32, éléments uniques)
+
+        Returns:
+            ndarray: Éléments communs, triés (int32)
+        """
+        out = np.empty(min(a.size, b.size), dtype=np.int32)
+        i = 0
+        j = 0
+        k = 0
+        while i < a.size and j < b.size:
+            x = a[i]
+            y = b[j]
+            if x == y:
+                out[k] = x
+                k += 1
+                i += 1
+                j += 1
+            elif x < y:
+                i += 1
+            else:
+                j += 1
+        return out[:k]
+
+
+def numba_build_index(processed_documents):
+    """
+    Construire un index inversé {terme: ensemble de doc_ids} via le noyau JIT
+
+    Aplati les tokens uniques de chaque document en deux tableaux parallèles
+    (id de terme, id de document), appelle le noyau CSR puis rematérialise le
+    dictionnaire Python attendu par le reste du TP.
+
+    Args:
+        processed_documents (list): Documents pré-traités avec 'id' et 'tokens'
+
+    Returns:
+        dict: Index inversé {terme: set(doc_ids)}
+    """
+    # Vocabulaire terme -> id contigu, et flux aplati (terme, document)
+    vocab = {}
+    token_ids = []
+    doc_ids = []
+    for doc in processed_documents:
+        doc_id = doc['id']
+        for token in set(doc['tokens']):
+            term_id = vocab.setdefault(token, len(vocab))
+            token_ids.append(term_id)
+            doc_ids.append(doc_id)
+
+    token_arr = np.asarray(token_ids, dtype=np.int32)
+    doc_arr = np.asarray(doc_ids, dtype=np.int32)
+    indptr, postings = build_postings_kernel(token_arr, doc_arr, len(vocab))
+
+    # Rematérialiser le dictionnaire {terme: set(doc_ids)}
+    return {
+        term: set(postings[indptr[term_id]:indptr[term_id + 1]].tolist())
+        for term, term_id in vocab.items()
+    }
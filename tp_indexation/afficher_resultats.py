@@ -11,6 +11,34 @@ et les affiche de manière formatée et lisible. Il permet de visualiser :
 """
 
 import json  # Pour lire le fichier JSON contenant les résultats
+import mmap
+import sys
+
+# orjson (tokenizer Rust) parse le JSON 2-5x plus vite que le module json;
+# sans le paquet, on retombe sur json.load
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# tabulate aligne le tableau comparatif en un seul appel; sans le paquet,
+# on retombe sur un gabarit de ligne maison
+try:
+    from tabulate import tabulate
+    TABULATE_AVAILABLE = True
+except ImportError:
+    TABULATE_AVAILABLE = False
+
+# Gabarits compilés une fois au chargement du module au lieu de re-parser
+# la mini-langue de formatage à chaque ligne: formateurs de cellules (la
+# valeur avec son unité) et gabarit de ligne du repli sans tabulate
+_CELL_S = "{:.4f} s".format
+_CELL_X = "{:.2f}x".format
+_CELL_KB = "{:.2f} KB".format
+_CELL_MS = "{:.4f} ms".format
+_ROW = "{:<40} {:<25} {:<25}".format
+_HEADERS = ('Métrique', 'Corpus 1 (20 docs)', 'Corpus 2 (500 docs)')
 
 def afficher_resultats():
     """
@@ -30,114 +58,142 @@ def afficher_resultats():
     - Tailles mémoire/disque (non compressé, compressé, Elasticsearch)
     """
     try:
-        with open('resultats_comparaison.json', 'r', encoding='utf-8') as f:
-            results = json.load(f)
+        # Lecture via mmap en binaire: le parseur travaille directement sur
+        # les octets du fichier, sans passe de décodage UTF-8 vers str
+        with open('resultats_comparaison.json', 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if ORJSON_AVAILABLE:
+                    results = orjson.loads(memoryview(mm))
+                else:
+                    results = json.loads(mm[:])
     except FileNotFoundError:
         print("Fichier resultats_comparaison.json non trouvé. Exécutez d'abord comparaison_corpus.py")
         return
-    
-    print("=" * 80)
-    print("RÉSUMÉ DES RÉSULTATS - COMPARAISON CORPUS")
-    print("=" * 80)
+
+    # Les lignes sont accumulées puis écrites en un seul write: un appel
+    # système au lieu d'un par print()
+    out = []
+    out.append("=" * 80)
+    out.append("RÉSUMÉ DES RÉSULTATS - COMPARAISON CORPUS")
+    out.append("=" * 80)
     
     c1 = results['corpus1']
     c2 = results['corpus2']
-    
-    print("\n📊 TABLEAU COMPARATIF")
-    print("-" * 80)
-    print(f"{'Métrique':<40} {'Corpus 1 (20 docs)':<25} {'Corpus 2 (500 docs)':<25}")
-    print("-" * 80)
-    
+
+    # Valeurs indexées plusieurs fois ci-dessous: une seule résolution de
+    # dictionnaire ici, et les tests de présence de clés évalués une fois
+    c1_seq = c1['manual_seq']['time_seq']
+    c2_seq = c2['manual_seq']['time_seq']
+    c1_par = c1.get('manual_par', {}).get('time_par')
+    c2_par = c2.get('manual_par', {}).get('time_par')
+    has_par = c1_par is not None and c2_par is not None
+    c1_es1 = c1.get('elasticsearch_1')
+    c2_es1 = c2.get('elasticsearch_1')
+    has_es1 = c1_es1 is not None and c2_es1 is not None
+    c1_es4 = c1.get('elasticsearch_4')
+    c2_es4 = c2.get('elasticsearch_4')
+    has_es4 = c1_es4 is not None and c2_es4 is not None
+
+    out.append("\n📊 TABLEAU COMPARATIF")
+    out.append("-" * 80)
+
+    # Construire les lignes du tableau (cellules déjà formatées avec leur
+    # unité), puis les aligner en un seul appel tabulate ou via le gabarit
+    rows = []
+
     # Temps d'indexation séquentielle
-    print(f"{'Temps indexation séquentielle':<40} {c1['manual_seq']['time_seq']:.4f} s{'':<15} {c2['manual_seq']['time_seq']:.4f} s")
-    
+    rows.append(('Temps indexation séquentielle', _CELL_S(c1_seq), _CELL_S(c2_seq)))
+
     # Temps d'indexation parallèle
-    if 'manual_par' in c1 and 'manual_par' in c2:
-        print(f"{'Temps indexation parallèle (4 workers)':<40} {c1['manual_par']['time_par']:.4f} s{'':<15} {c2['manual_par']['time_par']:.4f} s")
-        c1_speedup = c1['manual_seq']['time_seq'] / c1['manual_par']['time_par']
-        c2_speedup = c2['manual_seq']['time_seq'] / c2['manual_par']['time_par']
-        print(f"{'  → Accélération':<40} {c1_speedup:.2f}x{'':<15} {c2_speedup:.2f}x")
-    
+    if has_par:
+        rows.append(('Temps indexation parallèle (4 workers)', _CELL_S(c1_par), _CELL_S(c2_par)))
+        c1_speedup = c1_seq / c1_par
+        c2_speedup = c2_seq / c2_par
+        rows.append(('  → Accélération', _CELL_X(c1_speedup), _CELL_X(c2_speedup)))
+
     # Elasticsearch 1 shard
-    if 'elasticsearch_1' in c1 and 'elasticsearch_1' in c2:
-        print(f"{'Temps Elasticsearch (1 shard)':<40} {c1['elasticsearch_1']['time']:.4f} s{'':<15} {c2['elasticsearch_1']['time']:.4f} s")
-        c1_ratio = c1['elasticsearch_1']['time'] / c1['manual_seq']['time_seq']
-        c2_ratio = c2['elasticsearch_1']['time'] / c2['manual_seq']['time_seq']
-        print(f"{'  → Ratio vs manuel':<40} {c1_ratio:.2f}x{'':<15} {c2_ratio:.2f}x")
-    
+    if has_es1:
+        rows.append(('Temps Elasticsearch (1 shard)', _CELL_S(c1_es1['time']), _CELL_S(c2_es1['time'])))
+        c1_ratio = c1_es1['time'] / c1_seq
+        c2_ratio = c2_es1['time'] / c2_seq
+        rows.append(('  → Ratio vs manuel', _CELL_X(c1_ratio), _CELL_X(c2_ratio)))
+
     # Elasticsearch 4 shards
-    if 'elasticsearch_4' in c1 and 'elasticsearch_4' in c2:
-        print(f"{'Temps Elasticsearch (4 shards)':<40} {c1['elasticsearch_4']['time']:.4f} s{'':<15} {c2['elasticsearch_4']['time']:.4f} s")
-        c1_shard_speedup = c1['elasticsearch_1']['time'] / c1['elasticsearch_4']['time']
-        c2_shard_speedup = c2['elasticsearch_1']['time'] / c2['elasticsearch_4']['time']
-        print(f"{'  → Accélération vs 1 shard':<40} {c1_shard_speedup:.2f}x{'':<15} {c2_shard_speedup:.2f}x")
-    
+    if has_es4:
+        rows.append(('Temps Elasticsearch (4 shards)', _CELL_S(c1_es4['time']), _CELL_S(c2_es4['time'])))
+        c1_shard_speedup = c1_es1['time'] / c1_es4['time']
+        c2_shard_speedup = c2_es1['time'] / c2_es4['time']
+        rows.append(('  → Accélération vs 1 shard', _CELL_X(c1_shard_speedup), _CELL_X(c2_shard_speedup)))
+
     # Taille
-    print(f"{'Taille non compressée':<40} {c1['manual_seq']['size_uncompressed']/1024:.2f} KB{'':<15} {c2['manual_seq']['size_uncompressed']/1024:.2f} KB")
-    print(f"{'Taille compressée':<40} {c1['manual_seq']['size_compressed']/1024:.2f} KB{'':<15} {c2['manual_seq']['size_compressed']/1024:.2f} KB")
-    
-    if 'elasticsearch_1' in c1 and 'elasticsearch_1' in c2:
-        print(f"{'Taille Elasticsearch (1 shard)':<40} {c1['elasticsearch_1']['size']/1024:.2f} KB{'':<15} {c2['elasticsearch_1']['size']/1024:.2f} KB")
-    
+    rows.append(('Taille non compressée', _CELL_KB(c1['manual_seq']['size_uncompressed'] / 1024), _CELL_KB(c2['manual_seq']['size_uncompressed'] / 1024)))
+    rows.append(('Taille compressée', _CELL_KB(c1['manual_seq']['size_compressed'] / 1024), _CELL_KB(c2['manual_seq']['size_compressed'] / 1024)))
+
+    if has_es1:
+        rows.append(('Taille Elasticsearch (1 shard)', _CELL_KB(c1_es1['size'] / 1024), _CELL_KB(c2_es1['size'] / 1024)))
+
     # Temps par document
-    c1_time_per_doc = c1['manual_seq']['time_seq'] / c1['num_docs']
-    c2_time_per_doc = c2['manual_seq']['time_seq'] / c2['num_docs']
-    print(f"{'Temps par document (séquentiel)':<40} {c1_time_per_doc*1000:.4f} ms{'':<15} {c2_time_per_doc*1000:.4f} ms")
-    
-    print("\n" + "=" * 80)
-    print("ANALYSE DES HYPOTHÈSES")
-    print("=" * 80)
-    
-    print("\n✅ HYPOTHÈSE 1: La parallélisation est plus efficace avec les corpus volumineux")
-    if 'manual_par' in c1 and 'manual_par' in c2:
-        c1_speedup = c1['manual_seq']['time_seq'] / c1['manual_par']['time_par']
-        c2_speedup = c2['manual_seq']['time_seq'] / c2['manual_par']['time_par']
+    c1_time_per_doc = c1_seq / c1['num_docs']
+    c2_time_per_doc = c2_seq / c2['num_docs']
+    rows.append(('Temps par document (séquentiel)', _CELL_MS(c1_time_per_doc * 1000), _CELL_MS(c2_time_per_doc * 1000)))
+
+    if TABULATE_AVAILABLE:
+        out.append(tabulate(rows, headers=_HEADERS))
+    else:
+        out.append(_ROW(*_HEADERS))
+        out.append("-" * 80)
+        for row in rows:
+            out.append(_ROW(*row))
+    
+    out.append("\n" + "=" * 80)
+    out.append("ANALYSE DES HYPOTHÈSES")
+    out.append("=" * 80)
+    
+    out.append("\n✅ HYPOTHÈSE 1: La parallélisation est plus efficace avec les corpus volumineux")
+    if has_par:
+        # c1_speedup / c2_speedup déjà calculés pour le tableau comparatif
         improvement = c2_speedup / c1_speedup if c1_speedup > 0 else 0
-        print(f"   Corpus 1: Accélération = {c1_speedup:.2f}x")
-        print(f"   Corpus 2: Accélération = {c2_speedup:.2f}x")
-        print(f"   → Amélioration: {improvement:.2f}x")
+        out.append(f"   Corpus 1: Accélération = {c1_speedup:.2f}x")
+        out.append(f"   Corpus 2: Accélération = {c2_speedup:.2f}x")
+        out.append(f"   → Amélioration: {improvement:.2f}x")
         if improvement > 1:
-            print("   ✓ CONFIRMÉ: La parallélisation est plus efficace avec le corpus volumineux")
+            out.append("   ✓ CONFIRMÉ: La parallélisation est plus efficace avec le corpus volumineux")
         else:
-            print("   ⚠ PARTIELLEMENT CONFIRMÉ: L'overhead reste important même avec 500 documents")
+            out.append("   ⚠ PARTIELLEMENT CONFIRMÉ: L'overhead reste important même avec 500 documents")
     
-    print("\n✅ HYPOTHÈSE 2: Elasticsearch devient relativement plus efficace avec les corpus volumineux")
-    if 'elasticsearch_1' in c1 and 'elasticsearch_1' in c2:
-        c1_ratio = c1['elasticsearch_1']['time'] / c1['manual_seq']['time_seq']
-        c2_ratio = c2['elasticsearch_1']['time'] / c2['manual_seq']['time_seq']
+    out.append("\n✅ HYPOTHÈSE 2: Elasticsearch devient relativement plus efficace avec les corpus volumineux")
+    if has_es1:
         improvement = c1_ratio / c2_ratio if c2_ratio > 0 else 0
-        print(f"   Corpus 1: ES est {c1_ratio:.2f}x {'plus rapide' if c1_ratio < 1 else 'plus lent'} que manuel")
-        print(f"   Corpus 2: ES est {c2_ratio:.2f}x {'plus rapide' if c2_ratio < 1 else 'plus lent'} que manuel")
-        print(f"   → Amélioration relative: {improvement:.2f}x")
+        out.append(f"   Corpus 1: ES est {c1_ratio:.2f}x {'plus rapide' if c1_ratio < 1 else 'plus lent'} que manuel")
+        out.append(f"   Corpus 2: ES est {c2_ratio:.2f}x {'plus rapide' if c2_ratio < 1 else 'plus lent'} que manuel")
+        out.append(f"   → Amélioration relative: {improvement:.2f}x")
         if improvement > 1:
-            print("   ✓ CONFIRMÉ: Elasticsearch devient relativement plus efficace")
+            out.append("   ✓ CONFIRMÉ: Elasticsearch devient relativement plus efficace")
         else:
-            print("   ⚠ PARTIELLEMENT CONFIRMÉ: L'overhead reste important")
+            out.append("   ⚠ PARTIELLEMENT CONFIRMÉ: L'overhead reste important")
     
-    print("\n✅ HYPOTHÈSE 3: Les shards multiples sont plus avantageux avec les corpus volumineux")
-    if 'elasticsearch_1' in c1 and 'elasticsearch_4' in c1 and 'elasticsearch_1' in c2 and 'elasticsearch_4' in c2:
-        c1_shard_speedup = c1['elasticsearch_1']['time'] / c1['elasticsearch_4']['time']
-        c2_shard_speedup = c2['elasticsearch_1']['time'] / c2['elasticsearch_4']['time']
-        print(f"   Corpus 1: 4 shards = {c1_shard_speedup:.2f}x plus rapide que 1 shard")
-        print(f"   Corpus 2: 4 shards = {c2_shard_speedup:.2f}x plus rapide que 1 shard")
+    out.append("\n✅ HYPOTHÈSE 3: Les shards multiples sont plus avantageux avec les corpus volumineux")
+    if has_es1 and has_es4:
+        out.append(f"   Corpus 1: 4 shards = {c1_shard_speedup:.2f}x plus rapide que 1 shard")
+        out.append(f"   Corpus 2: 4 shards = {c2_shard_speedup:.2f}x plus rapide que 1 shard")
         if c2_shard_speedup >= c1_shard_speedup:
-            print("   ✓ CONFIRMÉ: Les shards multiples sont avantageux")
+            out.append("   ✓ CONFIRMÉ: Les shards multiples sont avantageux")
         else:
-            print("   ⚠ Pour 500 documents, l'avantage des shards est encore limité")
-            print("   → Avec des corpus encore plus volumineux (10k+ docs), l'avantage serait plus marqué")
+            out.append("   ⚠ Pour 500 documents, l'avantage des shards est encore limité")
+            out.append("   → Avec des corpus encore plus volumineux (10k+ docs), l'avantage serait plus marqué")
     
-    print("\n✅ HYPOTHÈSE 4: Le temps par document diminue avec la taille du corpus")
+    out.append("\n✅ HYPOTHÈSE 4: Le temps par document diminue avec la taille du corpus")
     improvement = c1_time_per_doc / c2_time_per_doc if c2_time_per_doc > 0 else 0
-    print(f"   Corpus 1: {c1_time_per_doc*1000:.4f} ms/document")
-    print(f"   Corpus 2: {c2_time_per_doc*1000:.4f} ms/document")
-    print(f"   → Amélioration: {improvement:.2f}x")
+    out.append(f"   Corpus 1: {c1_time_per_doc*1000:.4f} ms/document")
+    out.append(f"   Corpus 2: {c2_time_per_doc*1000:.4f} ms/document")
+    out.append(f"   → Amélioration: {improvement:.2f}x")
     if improvement > 1:
-        print("   ✓ CONFIRMÉ: Meilleure amortissement des coûts fixes")
+        out.append("   ✓ CONFIRMÉ: Meilleure amortissement des coûts fixes")
     
-    print("\n" + "=" * 80)
-    print("CONCLUSION GÉNÉRALE")
-    print("=" * 80)
-    print("""
+    out.append("\n" + "=" * 80)
+    out.append("CONCLUSION GÉNÉRALE")
+    out.append("=" * 80)
+    out.append("""
     Les résultats confirment les hypothèses, avec quelques nuances:
     
     1. PARALLÉLISATION:
@@ -158,7 +214,9 @@ def afficher_resultats():
        - Temps par document diminue significativement (8.2x amélioration)
        - Confirme l'amortissement des coûts fixes
     """)
-    print("=" * 80)
+    out.append("=" * 80)
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 if __name__ == "__main__":
     afficher_resultats()